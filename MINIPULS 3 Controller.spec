@@ -5,7 +5,7 @@ a = Analysis(
     ['debugv2.py'],
     pathex=[],
     binaries=[],
-    datas=[('minipuls3_icon.ico', '.')],
+    datas=[('minipuls3_icon.ico', '.'), ('icons', 'icons')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
@@ -3,7 +3,15 @@ from tkinter import ttk, filedialog, messagebox, font
 import serial
 import time
 import json
+import hashlib
+import re
+import queue
 import threading
+import bisect
+import collections
+import itertools
+import contextlib
+import concurrent.futures
 import sys
 import os
 
@@ -13,13 +21,45 @@ try:
 except ImportError:
     sv_ttk = None
 
-# --- OPTIONAL: For plotting and styling ---
+# --- OPTIONAL: Faster sequence file load/save ---
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# --- OPTIONAL: For plan calculations and plotting ---
 try:
     import numpy as np
-    import matplotlib.pyplot as plt
-    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-    from matplotlib.figure import Figure
-    import matplotlib.lines as mlines
+except ImportError:
+    np = None
+
+# Matplotlib/Seaborn are slow to import, so they are loaded on first use by _ensure_plot_libs()
+plt = None
+FigureCanvasTkAgg = None
+Figure = None
+mlines = None
+mcollections = None
+sns = None
+_plot_available = None
+
+
+def _ensure_plot_libs():
+    """ Import the plotting libraries on first call. Returns True if plotting is available. """
+    global _plot_available, plt, FigureCanvasTkAgg, Figure, mlines, mcollections, sns
+    if _plot_available is not None:
+        return _plot_available
+    if np is None:
+        _plot_available = False
+        return False
+    try:
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+        import matplotlib.lines as mlines
+        import matplotlib.collections as mcollections
+    except ImportError:
+        _plot_available = False
+        return False
 
     # Use Seaborn for a more professional look if available
     try:
@@ -29,13 +69,47 @@ try:
         print("Seaborn style applied.")
     except ImportError:
         sns = None
-except ImportError:
-    np = None
-    plt = None
-    FigureCanvasTkAgg = None
-    Figure = None
-    mlines = None
-    sns = None
+    plt.ion()
+    _plot_available = True
+    return True
+
+
+def _cycle_span_verts(cycle_spans, time_factor):
+    """ One rectangle over the full RPM range (-2 to 52) per distinct cycle span, as an (N, 4, 2) array. """
+    spans = np.unique(np.asarray(cycle_spans, dtype=np.float64).reshape(-1, 2) * time_factor, axis=0)
+    x0, x1 = spans[:, 0], spans[:, 1]
+    lo, hi = np.full_like(x0, -2.0), np.full_like(x0, 52.0)
+    return np.stack((np.column_stack((x0, lo)), np.column_stack((x0, hi)),
+                     np.column_stack((x1, hi)), np.column_stack((x1, lo))), axis=1)
+
+
+def _draw_cycle_spans(ax, cycle_spans, time_factor, **kwargs):
+    """ Shade the cycle spans over the full RPM range as a single collection (or None if no spans). """
+    verts = _cycle_span_verts(cycle_spans, time_factor)
+    if not len(verts):
+        return None
+    return ax.add_collection(mcollections.PolyCollection(verts, facecolors='lightskyblue', alpha=0.3, zorder=0,
+                                                         **kwargs))
+
+
+def _minmax_decimate(x, y, buckets):
+    """ Thin a polyline to the minimum and maximum y of each of `buckets` equal runs of points, in time order.
+
+    Lines with no more than 4 points per bucket are returned unchanged; the first and last points are always kept.
+    """
+    n = len(x)
+    if buckets < 1 or n <= 4 * buckets:
+        return x, y
+    size = -(-n // buckets)
+    # Pad the tail with the last point so the samples reshape into full buckets without changing any extreme
+    idx = np.minimum(np.arange(buckets * size), n - 1).reshape(buckets, size)
+    offsets = np.arange(buckets) * size
+    lo, hi = y[idx].argmin(axis=1) + offsets, y[idx].argmax(axis=1) + offsets
+    keep = np.empty(2 * buckets + 2, dtype=np.intp)
+    keep[0], keep[-1] = 0, n - 1
+    keep[1:-1:2], keep[2:-1:2] = np.minimum(lo, hi), np.maximum(lo, hi)
+    keep = np.minimum(keep, n - 1)
+    return x[keep], y[keep]
 
 
 # ==============================================================================
@@ -56,40 +130,163 @@ def resource_path(relative_path):
 class MinipulsController:
     """A Python class to control the Gilson MINIPULS 3 via the GSIOC protocol."""
 
-    def __init__(self, port, unit_id=30, baudrate=19200, logger_func=print, debug_mode=False, command_interval=0.2):
+    # Framed "R<rpm*100>" commands, shared by all instances (at most 4801 entries for 0-48.00 RPM).
+    _speed_cmd_cache = {}
+
+    CONNECT_TIMEOUT_S = 1.0
+    CONNECT_POLL_MS = 10
+
+    def __init__(self, port, unit_id=30, baudrate=19200, logger_func=print, debug_mode=False, command_interval=0.2,
+                 scheduler=None):
         self.port, self.unit_id, self.baudrate = port, unit_id, baudrate
         self.ser, self.is_connected, self.logger = None, False, logger_func
         self.debug_mode = debug_mode
         self.command_interval = command_interval
+        # Callable with the signature of Tk's after(ms, func); used to poll for replies without blocking.
+        self.scheduler = scheduler
+        # Commands are written by a dedicated thread so callers never sleep through the command interval.
+        # The queue holds a single pending command: one command can be queued while the previous
+        # interval elapses, and producers are throttled to the pump's pace instead of piling up.
+        self._tx_queue = queue.Queue(maxsize=1)
+        self._tx_thread = None
+
+    def _start_writer(self):
+        self._tx_thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self._tx_thread.start()
+
+    def _stop_writer(self):
+        """ Flush any pending commands and stop the writer thread. """
+        if self._tx_thread and self._tx_thread.is_alive():
+            self._tx_queue.put(None)
+            self._tx_thread.join()
+        self._tx_thread = None
+
+    def _writer_loop(self):
+        next_write_ts = time.monotonic()
+        while True:
+            item = self._tx_queue.get()
+            if item is None:
+                return
+            payload, wait = item
+            delay = next_write_ts - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+            command = payload[1:-1].decode("ascii")
+            if self.debug_mode:
+                self.logger(f"DEBUG CMD > {command}")
+            else:
+                try:
+                    self.ser.write(payload)
+                    self.logger(f"Sending command: {command}")
+                except serial.SerialException as e:
+                    self.logger(f"Write Error: {e}")
+            next_write_ts = time.monotonic() + (self.command_interval if wait else 0.0)
+
+    def _schedule(self, delay_ms, func):
+        if self.scheduler:
+            self.scheduler(delay_ms, func)
+        else:
+            time.sleep(delay_ms / 1000.0)
+            func()
 
-    def connect(self):
+    def connect(self, on_complete=None):
+        """ Open the port and start the GSIOC handshake.
+
+        The pump's acknowledgement is polled without blocking; on_complete(success) is called once it arrives
+        or CONNECT_TIMEOUT_S expires.
+        """
+        on_complete = on_complete or (lambda success: None)
         if self.debug_mode:
             self.logger("DEBUG MODE: Virtual connection established.")
             self.is_connected = True
-            return True
+            self._start_writer()
+            on_complete(True)
+            return
         try:
             self.ser = serial.Serial(self.port, self.baudrate, bytesize=serial.EIGHTBITS, parity=serial.PARITY_EVEN,
-                                     stopbits=serial.STOPBITS_ONE, timeout=1)
+                                     stopbits=serial.STOPBITS_ONE, timeout=0)
             self.logger(f"Serial port {self.port} opened.")
             self.logger(f"Connecting to Unit ID: {self.unit_id}...")
-            self.ser.write(bytes([255]));
-            time.sleep(0.05)
+            # Disconnect-all (255) followed by the unit's connect byte, sent back to back in one write
             connect_command = bytes([self.unit_id + 128])
-            self.ser.write(connect_command)
-            response = self.ser.read(1)
-            if response == connect_command:
-                self.logger(f"Successfully connected to pump (ID: {self.unit_id}).");
-                self.is_connected = True;
-                return True
-            else:
-                self.logger(f"Connection failed. Expected {connect_command.hex()} but received {response.hex()}");
-                self.ser.close();
-                return False
+            self.ser.write(bytes([255]) + connect_command)
         except serial.SerialException as e:
             self.logger(f"Connection Error: {e}");
-            return False
+            on_complete(False)
+            return
+        deadline = time.monotonic() + self.CONNECT_TIMEOUT_S
+        self._schedule(self.CONNECT_POLL_MS, lambda: self._poll_connect_ack(deadline, connect_command, on_complete))
+
+    def _poll_connect_ack(self, deadline, expected, on_complete):
+        try:
+            response = self.ser.read(self.ser.in_waiting or 1)[:1]
+        except serial.SerialException as e:
+            self.logger(f"Connection Error: {e}");
+            self.ser.close();
+            on_complete(False)
+            return
 
-    def disconnect(self):
+        if response == expected:
+            self.logger(f"Successfully connected to pump (ID: {self.unit_id}).");
+            self.is_connected = True;
+            self._start_writer()
+            on_complete(True)
+        elif response or time.monotonic() >= deadline:
+            self.logger(f"Connection failed. Expected {expected.hex()} but received {response.hex()}");
+            self.ser.close();
+            on_complete(False)
+        else:
+            self._schedule(self.CONNECT_POLL_MS, lambda: self._poll_connect_ack(deadline, expected, on_complete))
+
+    def lower_latency(self):
+        """ Ask the USB-serial driver for its minimum latency timer (1 ms instead of the usual 16 ms).
+
+        Best effort: failures are logged and the connection carries on at the driver default.
+        """
+        if self.debug_mode or not self.ser:
+            return
+        if sys.platform.startswith('linux'):
+            device = os.path.basename(os.path.realpath(self.port))
+            try:
+                with open(f"/sys/bus/usb-serial/devices/{device}/latency_timer", 'w') as f:
+                    f.write('1')
+                self.logger(f"Latency timer of {device} set to 1 ms.")
+                return
+            except OSError:
+                pass
+            # Same TIOCSSERIAL low_latency request as `setserial <port> low_latency`, usually allowed without root
+            try:
+                self.ser.set_low_latency_mode(True)
+                self.logger(f"Low latency mode enabled on {self.port}.")
+            except (AttributeError, OSError, ValueError) as e:
+                self.logger(f"Could not lower serial latency on {self.port}: {e}")
+        elif sys.platform == 'win32':
+            self.logger("Tip: for faster pump response set the port's Latency Timer to 1 ms "
+                        "(Device Manager > Port Settings > Advanced).")
+
+    def disconnect(self, on_complete=None):
+        """ Flush the pending commands, release the pump and close the port.
+
+        With on_complete and a scheduler, the flush runs on a helper thread so the caller is not held up by the
+        command interval; on_complete() is then called through the scheduler once the port is closed.
+        """
+        if not (on_complete and self.scheduler):
+            self._close_connection()
+            if on_complete: on_complete()
+            return
+        closer = threading.Thread(target=self._close_connection, daemon=True)
+        closer.start()
+        self._schedule(self.CONNECT_POLL_MS, lambda: self._poll_disconnected(closer, on_complete))
+
+    def _poll_disconnected(self, closer, on_complete):
+        if closer.is_alive():
+            self._schedule(self.CONNECT_POLL_MS, lambda: self._poll_disconnected(closer, on_complete))
+        else:
+            on_complete()
+
+    def _close_connection(self):
+        self._stop_writer()
         if self.debug_mode:
             self.logger("DEBUG MODE: Virtual connection closed.")
             self.is_connected = False
@@ -97,7 +294,7 @@ class MinipulsController:
         if self.ser and self.ser.is_open:
             try:
                 self.ser.write(bytes([255]));
-                time.sleep(0.05);
+                self.ser.flush();
                 self.ser.close()
                 self.logger(f"Serial port {self.port} closed.")
             except Exception as e:
@@ -105,21 +302,17 @@ class MinipulsController:
         self.is_connected = False
 
     def send_buffered_command(self, command, wait=True):
+        """ Queue a command for the writer thread. If wait is set, the next command is held back by command_interval.
+
+        command is either the bare command text or an already framed bytes payload.
+        """
         if not self.is_connected:
             self.logger("Error: Pump not connected.")
             return
 
-        if self.debug_mode:
-            self.logger(f"DEBUG CMD > {command}")
-            if wait:
-                time.sleep(self.command_interval)
-            return
-
-        full_command = b"\n" + command.encode("ascii") + b"\r"
-        self.logger(f"Sending command: {command}")
-        self.ser.write(full_command)
-        if wait:
-            time.sleep(self.command_interval)
+        if isinstance(command, str):
+            command = b"\n" + command.encode("ascii") + b"\r"
+        self._tx_queue.put((command, wait))
 
     def set_command_interval(self, interval):
         self.command_interval = interval
@@ -144,12 +337,21 @@ class MinipulsController:
         if not (0 <= rpm <= 48):
             rpm = max(0, min(48, rpm))
             self.logger(f"Warning: RPM value clamped to {rpm}.")
-        self.send_buffered_command(f"R{int(rpm * 100)}", wait=wait)
+        key = int(rpm * 100)
+        payload = self._speed_cmd_cache.get(key)
+        if payload is None:
+            payload = self._speed_cmd_cache[key] = b"\n" + f"R{key}".encode("ascii") + b"\r"
+        self.send_buffered_command(payload, wait=wait)
 
 
 # ==============================================================================
 # ## Dialog Windows for Adding Steps ##
 # ==============================================================================
+_RPM_RE = re.compile(r'^\d{1,2}(?:\.\d+)?$')
+_NUMBER_RE = re.compile(r'^\d+(?:\.\d+)?$')
+_INT_RE = re.compile(r'^\d+$')
+
+
 class AddPhaseDialog(tk.Toplevel):
     def __init__(self, parent, existing_data=None):
         super().__init__(parent);
@@ -197,15 +399,13 @@ class AddPhaseDialog(tk.Toplevel):
         self.wait_window(self)
 
     def on_ok(self):
-        try:
-            rpm = float(self.rpm_entry.get());
-            duration = float(self.duration_entry.get())
-            if not (0 <= rpm <= 48 and duration >= 0): raise ValueError
-            self.result = {"type": "Phase", "direction": self.direction_cb.get(), "mode": self.speed_mode_cb.get(),
-                           "rpm": rpm, "duration": duration, "unit": self.unit_combobox.get()};
-            self.destroy()
-        except (ValueError, TypeError):
+        rpm_text, duration_text = self.rpm_entry.get().strip(), self.duration_entry.get().strip()
+        if not (_RPM_RE.match(rpm_text) and _NUMBER_RE.match(duration_text)) or float(rpm_text) > 48:
             messagebox.showerror("Input Error", "RPM must be 0-48 and Duration must be a positive number.", parent=self)
+            return
+        self.result = {"type": "Phase", "direction": self.direction_cb.get(), "mode": self.speed_mode_cb.get(),
+                       "rpm": float(rpm_text), "duration": float(duration_text), "unit": self.unit_combobox.get()};
+        self.destroy()
 
 
 class AddCycleDialog(tk.Toplevel):
@@ -243,32 +443,37 @@ class AddCycleDialog(tk.Toplevel):
         self.wait_window(self)
 
     def on_ok(self):
-        try:
-            start = int(self.start_entry.get());
-            end = int(self.end_entry.get());
-            repeats = int(self.repeats_entry.get())
-            if not (start > 0 and end >= start and repeats > 0): raise ValueError
-            self.result = {"type": "Cycle", "start_phase": start, "end_phase": end, "repeats": repeats};
-            self.destroy()
-        except (ValueError, TypeError):
+        texts = [entry.get().strip() for entry in (self.start_entry, self.end_entry, self.repeats_entry)]
+        valid = all(_INT_RE.match(text) for text in texts)
+        if valid:
+            start, end, repeats = map(int, texts)
+            valid = start > 0 and end >= start and repeats > 0
+        if not valid:
             messagebox.showerror("Input Error",
                                  "All fields must be positive integers, and End Phase must be >= Start Phase.",
                                  parent=self)
+            return
+        self.result = {"type": "Cycle", "start_phase": start, "end_phase": end, "repeats": repeats};
+        self.destroy()
 
 
 class ConfirmationDialog(tk.Toplevel):
+    MAX_PHASE_LABELS = 30
+
     def __init__(self, parent, sequence_data):
         super().__init__(parent);
         self.parent = parent
         self.transient(parent);
         self.title("Confirm Sequence Execution");
         self.confirmed = False
+        self._preview_ax = None
+        self.protocol("WM_DELETE_WINDOW", self.destroy)
         self.geometry(f"+{parent.winfo_rootx() + 100}+{parent.winfo_rooty() + 100}")
 
         main_frame = ttk.Frame(self, padding="10");
         main_frame.pack(fill=tk.BOTH, expand=True)
 
-        if np and plt and FigureCanvasTkAgg:
+        if _ensure_plot_libs():
             self._create_plot(main_frame, sequence_data)
         else:
             ttk.Label(main_frame,
@@ -285,12 +490,13 @@ class ConfirmationDialog(tk.Toplevel):
         self.wait_window(self)
 
     def _create_plot(self, parent, sequence_data):
-        fig = Figure(figsize=(8, 5), dpi=100);
-        ax = fig.add_subplot(111)
+        fig, ax = self.parent._get_preview_figure()
+        ax.clear()
+        self._preview_ax = ax
 
-        plot_data = self.parent._get_expanded_sequence_data(sequence_data)
+        plot_data = self.parent._get_cached_sequence_data(sequence_data)
 
-        total_time_s = plot_data['time_points'][-1] if plot_data['time_points'] else 0
+        total_time_s = plot_data['time_points'][-1] if len(plot_data['time_points']) else 0
         if total_time_s < 120:
             time_unit, time_factor = 's', 1.0
         elif total_time_s < 7200:
@@ -298,24 +504,23 @@ class ConfirmationDialog(tk.Toplevel):
         else:
             time_unit, time_factor = 'hr', 1.0 / 3600.0
 
-        time_scaled = [t * time_factor for t in plot_data['time_points']]
-        rpm_data = plot_data['rpm_points']
-        phase_markers = plot_data['phase_markers']
+        time_scaled = np.asarray(plot_data['time_points'], dtype=np.float64) * time_factor
+        rpm_data = np.asarray(plot_data['rpm_points'], dtype=np.float64)
         cycle_spans = plot_data['cycle_spans']
 
         ax.plot(time_scaled, rpm_data, color='lightgray', linestyle='--', label='Plan', zorder=1)
 
-        marker_times = [p['time'] * time_factor for p in phase_markers]
-        marker_rpms = [p['rpm'] for p in phase_markers]
+        marker_times = plot_data['marker_times'] * time_factor
+        marker_rpms = plot_data['marker_rpms']
+        marker_steps = plot_data['marker_steps']
         ax.plot(marker_times, marker_rpms, 'o', color='#333333', markersize=5, zorder=2)
 
-        for marker in phase_markers:
-            ax.text(marker['time'] * time_factor, marker['rpm'] + 1.2, str(marker['step']), ha='center', va='bottom',
-                    fontsize=8, fontweight='bold')
+        # Label every k-th marker only, so long sequences stay readable and cost a bounded number of Text artists
+        k = max(1, -(-len(marker_steps) // self.MAX_PHASE_LABELS))
+        for x, y, step in zip(marker_times[::k], marker_rpms[::k], marker_steps[::k]):
+            ax.text(x, y + 1.2, str(step), ha='center', va='bottom', fontsize=8, fontweight='bold')
 
-        for span in cycle_spans:
-            ax.axvspan(span[0] * time_factor, span[1] * time_factor, color='lightskyblue', alpha=0.3, label='Cycle',
-                       zorder=0)
+        _draw_cycle_spans(ax, cycle_spans, time_factor, label='Cycle')
 
         handles, labels = ax.get_legend_handles_labels()
         by_label = dict(zip(labels, handles))
@@ -325,69 +530,106 @@ class ConfirmationDialog(tk.Toplevel):
         ax.set_xlabel(f"Time ({time_unit})", fontsize=10);
         ax.set_ylabel("Speed (RPM)", fontsize=10)
         ax.set_ylim(bottom=-2, top=52)
-        if time_scaled:
-            ax.set_xlim(left=min(time_scaled) - 0.05 * max(time_scaled), right=max(time_scaled) * 1.05)
+        if time_scaled.size:
+            # Plan times accumulate, so the ends of the array are its extremes
+            t_min, t_max = time_scaled[0], time_scaled[-1]
+            ax.set_xlim(left=t_min - 0.05 * t_max, right=t_max * 1.05)
 
         if not sns:
             ax.grid(True, linestyle='--', alpha=0.6)
 
-        fig.tight_layout(pad=1.5)
         canvas = FigureCanvasTkAgg(fig, master=parent);
-        canvas.draw();
+        canvas.draw_idle();
         canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
     def on_confirm(self):
         self.confirmed = True;
         self.destroy()
 
+    def destroy(self):
+        # The preview figure belongs to the main window and is reused; only drop this dialog's artists.
+        if self._preview_ax is not None:
+            self._preview_ax.clear()
+            self._preview_ax = None
+        super().destroy()
+
 
 # ==============================================================================
 # ## Main GUI Application ##
 # ==============================================================================
+# Seconds per phase duration unit; unknown units are treated as seconds
+_UNIT_TO_SEC = {'s': 1, 'min': 60, 'hr': 3600}
+
+
 class PumpControlUI(tk.Tk):
     RAMP_STEP_INTERVAL_S = 0.1
     UPDATE_INTERVAL_MS = 100
+    TREE_BULK_THRESHOLD = 50
+    # Longer sequences only keep the rows around the viewport in the tree
+    TREE_VIRTUAL_THRESHOLD = 500
+    TREE_WINDOW_BUFFER = 50
+    LOG_MAX_LINES = 2000
+    LOG_TRIM_SLACK = 200
+
+    LIVE_TRACE_INITIAL_POINTS = 1024
+    RENDER_POLL_MS = 10
+    # Past this many points a trace thins out its older half instead of growing further
+    LIVE_TRACE_MAX_POINTS = 16384
+
+    BUTTON_ICONS = ('connect', 'disconnect', 'forward', 'backward', 'stop', 'save', 'load', 'run', 'add', 'cycle',
+                    'remove', 'clear', 'up', 'down')
 
     COLOR_FORWARD = '#29b6f6'  # Blue
     COLOR_BACKWARD = '#f44336'  # Red
 
     def _log(self, message):
-        def _append():
-            self.log_text.config(state=tk.NORMAL)
-            self.log_text.insert(tk.END, f"{time.strftime('%H:%M:%S')} - {message}\n")
-            self.log_text.config(state=tk.DISABLED);
-            self.log_text.see(tk.END)
-
-        self.after(0, _append)
+        # Safe to call from any thread: it never touches Tk, the lines are written in batches by _drain_log
+        self._log_queue.append(f"{time.strftime('%H:%M:%S')} - {message}\n")
+
+    def _drain_log(self):
+        """ Write the queued log lines to the widget; reschedules itself, so it always runs on the Tk thread. """
+        self.after(self.UPDATE_INTERVAL_MS, self._drain_log)
+        lines = []
+        while self._log_queue:
+            lines.append(self._log_queue.popleft())
+        if not lines:
+            return
+        text = "".join(lines)
+        self.log_text.config(state=tk.NORMAL)
+        self.log_text.insert(tk.END, text)
+        # Trim in chunks of LOG_TRIM_SLACK lines so most drains do not touch the start of the widget
+        self._log_line_count += text.count("\n")
+        if self._log_line_count > self.LOG_MAX_LINES + self.LOG_TRIM_SLACK:
+            self.log_text.delete("1.0", f"end-{self.LOG_MAX_LINES + 1}l")
+            self._log_line_count = self.LOG_MAX_LINES
+        self.log_text.config(state=tk.DISABLED);
+        self.log_text.see(tk.END)
 
     def _update_speed_label(self, value):
-        val = float(value)
-        self.speed_label.config(text=f"{val:.1f} RPM")
-        if self.focus_get() != self.manual_rpm_entry:
-            self.manual_rpm_entry.delete(0, tk.END)
-            self.manual_rpm_entry.insert(0, f"{val:.1f}")
+        # The slider fires on every pixel of a drag; most moves do not change the 0.1 RPM text
+        text = f"{float(value):.1f}"
+        if text != self._speed_label_text:
+            self.speed_label.config(text=f"{text} RPM")
+            self._speed_label_text = text
+        if self.focus_get() != self.manual_rpm_entry and self._rpm_var.get() != text:
+            self._rpm_var.set(text)
 
     def _update_speed_from_entry(self, event=None):
         try:
-            val = float(self.manual_rpm_entry.get())
+            val = float(self._rpm_var.get())
             if not (0 <= val <= 48):
                 val = max(0, min(48, val))
-                self.manual_rpm_entry.delete(0, tk.END)
-                self.manual_rpm_entry.insert(0, f"{val:.1f}")
+                self._rpm_var.set(f"{val:.1f}")
             self.speed_scale.set(val)
+            self._speed_label_text = f"{val:.1f}"
             self.speed_label.config(text=f"{val:.1f} RPM")
         except (ValueError, TypeError):
             pass
 
     def _set_manual_controls_state(self, state):
-        for child in self.manual_frame.winfo_children():
-            try:
-                child.config(state=state)
-                if isinstance(child, ttk.Frame):
-                    for grandchild in child.winfo_children():
-                        grandchild.config(state=state)
-            except tk.TclError:
-                pass
+        state_flag = 'disabled' if state == tk.DISABLED else '!disabled'
+        for widget in self._manual_state_widgets:
+            widget.state([state_flag])
 
     def _connect_pump(self):
         port, unit_id = self.com_port_entry.get(), int(self.unit_id_entry.get())
@@ -403,29 +645,48 @@ class PumpControlUI(tk.Tk):
             return
 
         self.pump_controller = MinipulsController(port, unit_id, logger_func=self._log, debug_mode=is_debug,
-                                                  command_interval=command_interval)
+                                                  command_interval=command_interval, scheduler=self.after)
+
+        self.connect_btn.config(state=tk.DISABLED)
+        self.status_label.config(text="Status: Connecting...", foreground="#c0392b")
+        self.pump_controller.connect(self._on_pump_connect)
 
-        if self.pump_controller.connect():
-            status_text = "Status: Connected (DEBUG)" if is_debug else "Status: Connected"
+    def _on_pump_connect(self, success):
+        if not self.pump_controller:
+            return
+        if success:
+            status_text = "Status: Connected (DEBUG)" if self.pump_controller.debug_mode else "Status: Connected"
             self.status_label.config(text=status_text, foreground="#27ae60")
-            self.connect_btn.config(state=tk.DISABLED);
             self.disconnect_btn.config(state=tk.NORMAL)
             self.set_interval_btn.config(state=tk.NORMAL)
             self._set_manual_controls_state(tk.NORMAL);
             self.run_seq_btn.config(state=tk.NORMAL)
+            self.pump_controller.lower_latency()
             self.pump_controller.set_remote_mode()
         else:
             self.status_label.config(text="Status: Connection Failed", foreground="#c0392b")
+            self.connect_btn.config(state=tk.NORMAL)
             self.pump_controller = None
 
-    def _disconnect_pump(self):
-        if self.pump_controller: self.pump_controller.set_keypad_mode(); self.pump_controller.disconnect(); self.pump_controller = None
-        self.status_label.config(text="Status: Disconnected", foreground="#c0392b")
-        self.connect_btn.config(state=tk.NORMAL);
+    def _disconnect_pump(self, on_done=None):
         self.disconnect_btn.config(state=tk.DISABLED)
         self.set_interval_btn.config(state=tk.DISABLED)
         self._set_manual_controls_state(tk.DISABLED);
         self.run_seq_btn.config(state=tk.DISABLED)
+        controller, self.pump_controller = self.pump_controller, None
+        if not controller:
+            self._on_pump_disconnected(on_done)
+            return
+        controller.set_keypad_mode()
+        # The queued commands drain in the background; Connect stays disabled until the port is released.
+        # Never wait for the writer here: it would hold up the Tk thread for the whole flush.
+        self.status_label.config(text="Status: Disconnecting...", foreground="#c0392b")
+        controller.disconnect(on_complete=lambda: self._on_pump_disconnected(on_done))
+
+    def _on_pump_disconnected(self, on_done=None):
+        self.status_label.config(text="Status: Disconnected", foreground="#c0392b")
+        self.connect_btn.config(state=tk.NORMAL);
+        if on_done: on_done()
 
     def _set_command_interval(self):
         if not (self.pump_controller and self.pump_controller.is_connected):
@@ -458,19 +719,19 @@ class PumpControlUI(tk.Tk):
         dialog = AddPhaseDialog(self)
         if dialog.result:
             self.sequence_data.append(dialog.result)
-            self._update_treeview()
+            self._on_sequence_changed()
 
     def _add_cycle(self):
         dialog = AddCycleDialog(self)
         if dialog.result:
             self.sequence_data.append(dialog.result)
-            self._update_treeview()
+            self._on_sequence_changed()
 
     def _edit_item(self, event):
         selected_item_id = self.sequence_tree.focus()
         if not selected_item_id: return
 
-        index = self.sequence_tree.index(selected_item_id)
+        index = self._tree_index(selected_item_id)
         item_data = self.sequence_data[index]
 
         dialog_class = AddPhaseDialog if item_data['type'] == "Phase" else AddCycleDialog
@@ -478,13 +739,12 @@ class PumpControlUI(tk.Tk):
 
         if dialog.result:
             self.sequence_data[index] = dialog.result
-            self._update_treeview()
+            self._on_sequence_changed()
 
     def _move_item(self, direction):
-        selected_item_id = self.sequence_tree.focus()
-        if not selected_item_id: return
-
-        index = self.sequence_tree.index(selected_item_id)
+        # The focused row may have been scrolled out of the tree's window, so use the tracked model index
+        index = self._focus_row
+        if index is None: return
 
         if direction == 'up' and index > 0:
             self.sequence_data[index], self.sequence_data[index - 1] = self.sequence_data[index - 1], \
@@ -497,154 +757,429 @@ class PumpControlUI(tk.Tk):
         else:
             return
 
-        self._update_treeview()
-        new_item_id = self.sequence_tree.get_children()[new_selection_index]
+        # A swap only rewrites these two rows (plus the cycle totals)
+        self._on_sequence_changed(changed_rows=(index, new_selection_index))
+        new_item_id = f"row{new_selection_index}"
+        self._selected_rows, self._focus_row = {new_selection_index}, new_selection_index
+        self._show_tree_row(new_selection_index)
         self.sequence_tree.selection_set(new_item_id)
         self.sequence_tree.focus(new_item_id)
 
     def _remove_item(self):
-        selected_items = self.sequence_tree.selection()
-        if not selected_items: return
+        if not self._selected_rows: return
         if messagebox.askyesno("Confirm", "Remove selected step(s)?"):
-            indices_to_remove = sorted([self.sequence_tree.index(item) for item in selected_items], reverse=True)
+            indices_to_remove = sorted(self._selected_rows, reverse=True)
+            # Rows are reused by position, so drop the selection rather than let it land on the next steps
+            self.sequence_tree.selection_remove(self.sequence_tree.selection())
+            self.sequence_tree.focus('')
+            self._selected_rows, self._focus_row = set(), None
             for index in indices_to_remove:
                 del self.sequence_data[index]
-            self._update_treeview()
+            self._on_sequence_changed()
 
     def _clear_sequence(self):
         if messagebox.askyesno("Confirm", "Are you sure you want to clear all sequence steps?"):
             self.sequence_data.clear()
+            self._on_sequence_changed()
+
+    def _on_sequence_changed(self, changed_rows=None):
+        # Call after any mutation of self.sequence_data; changed_rows limits the tree refresh to those rows
+        self._expanded_cache.clear()
+        self._recompute_phase_seconds()
+        if changed_rows is None:
             self._update_treeview()
+        else:
+            self._refresh_tree_rows(sorted(set(changed_rows).union(self._cycle_rows)))
+
+    def _recompute_phase_seconds(self):
+        # Per-step durations (0 for cycles), their prefix sums, the cycle rows and the step arrays
+        self._phase_seconds = [
+            step['duration'] * _UNIT_TO_SEC.get(step['unit'], 1) if step['type'] == 'Phase' else 0
+            for step in self.sequence_data]
+        # _phase_seconds_prefix[j] is the total of the first j steps, so a cycle total is one subtraction
+        self._phase_seconds_prefix = [0, *itertools.accumulate(self._phase_seconds)]
+        self._cycle_rows = [i for i, step in enumerate(self.sequence_data) if step['type'] == 'Cycle']
+        if np is not None:
+            self._seq_duration, self._seq_rpm, self._seq_dir, self._seq_ramp = self._sequence_arrays(self.sequence_data)
+
+    def _tree_row_values(self, i):
+        step_num = i + 1
+        step_data = self.sequence_data[i]
+        if step_data['type'] == 'Phase':
+            p = step_data
+            details = f"{p['direction']}, {p['mode']} to {p['rpm']} RPM"
+            duration_str = f"{p['duration']} {p['unit']}"
+            values = (step_num, "Phase", details, duration_str)
+        elif step_data['type'] == 'Cycle':
+            c = step_data;
+            total_duration_s = 0
+            if c['start_phase'] <= len(self.sequence_data) and c['end_phase'] <= len(self.sequence_data):
+                prefix = self._phase_seconds_prefix
+                total_duration_s = prefix[c['end_phase']] - prefix[c['start_phase'] - 1]
+            details = f"Loop Phases {c['start_phase']}-{c['end_phase']} ({c['repeats']} times)"
+            duration_str = f"~{total_duration_s:.1f} s/cycle"
+            values = (step_num, "Cycle", details, duration_str)
+        return values
+
+    def _refresh_tree_rows(self, indices):
+        # Push only the rows whose values changed
+        start, end = self._tree_window
+        for i in indices:
+            values = self._tree_row_values(i)
+            if self._tree_row_cache[i] != values:
+                self._tree_row_cache[i] = values
+                if start <= i < end:
+                    self.sequence_tree.item(f"row{i}", values=values)
 
     def _update_treeview(self):
-        selected = self.sequence_tree.focus()
-        scroll_pos = self.sequence_tree.yview()
-        for item in self.sequence_tree.get_children(): self.sequence_tree.delete(item)
-
-        for i, step_data in enumerate(self.sequence_data):
-            step_num = i + 1
-            if step_data['type'] == 'Phase':
-                p = step_data
-                details = f"{p['direction']}, {p['mode']} to {p['rpm']} RPM"
-                duration_str = f"{p['duration']} {p['unit']}"
-                values = (step_num, "Phase", details, duration_str)
-            elif step_data['type'] == 'Cycle':
-                c = step_data;
-                total_duration_s = 0
-                if c['start_phase'] <= len(self.sequence_data) and c['end_phase'] <= len(self.sequence_data):
-                    for phase_idx in range(c['start_phase'] - 1, c['end_phase']):
-                        phase = self.sequence_data[phase_idx]
-                        if phase['type'] == 'Phase':
-                            d = phase['duration']
-                            if phase['unit'] == 'min':
-                                d *= 60
-                            elif phase['unit'] == 'hr':
-                                d *= 3600
-                            total_duration_s += d
-                details = f"Loop Phases {c['start_phase']}-{c['end_phase']} ({c['repeats']} times)"
-                duration_str = f"~{total_duration_s:.1f} s/cycle"
-                values = (step_num, "Cycle", details, duration_str)
-            self.sequence_tree.insert("", tk.END, values=values)
-
-        if selected:
-            try:
-                self.sequence_tree.selection_set(selected);
-                self.sequence_tree.focus(selected)
-            except tk.TclError:
-                pass
-        self.sequence_tree.yview_moveto(scroll_pos[0])
-
-    def _get_expanded_sequence_data(self, sequence_data):
-        command_interval = getattr(self, "pump_controller", None)
-        if command_interval:
-            command_interval = command_interval.command_interval
+        """ Sync the tree with self.sequence_data, touching only the rows whose values changed. """
+        rows = [self._tree_row_values(i) for i in range(len(self.sequence_data))]
+        if len(rows) < len(self._tree_row_cache):
+            self._selected_rows = {i for i in self._selected_rows if i < len(rows)}
+            if self._focus_row is not None and self._focus_row >= len(rows):
+                self._focus_row = None
+        _, start, end = self._tree_window_for(self._tree_first_visible(), len(rows))
+        self._apply_tree_window(rows, start, end, allow_bulk=True)
+
+    def _apply_tree_window(self, rows, new_start, new_end, allow_bulk=False):
+        # Make the tree hold exactly rows[new_start:new_end], diffing against what it holds now
+        cached_rows = self._tree_row_cache
+        old_start, old_end = self._tree_window
+        keep_start, keep_end = max(old_start, new_start), min(old_end, new_end)
+        if keep_start >= keep_end:
+            keep_start = keep_end = new_start
+        changed = [i for i in range(keep_start, keep_end) if cached_rows[i] != rows[i]]
+        removed = [f"row{i}" for i in range(old_start, old_end) if not keep_start <= i < keep_end]
+
+        # For large refreshes (e.g. loading a file) unmap the tree so Tk does not redraw it per row
+        num_ops = len(changed) + len(removed) + (keep_start - new_start) + (new_end - keep_end)
+        bulk = allow_bulk and num_ops > self.TREE_BULK_THRESHOLD
+        if bulk:
+            pack_info = self.sequence_tree.pack_info()
+            self.sequence_tree.pack_forget()
+
+        for i in changed:
+            self.sequence_tree.item(f"row{i}", values=rows[i])
+        if removed:
+            self.sequence_tree.delete(*removed)
+        # Rows before the kept range go in at their positions from the top, rows after it are appended
+        self._bulk_insert([(f"row{i}", position, rows[i]) for position, i in enumerate(range(new_start, keep_start))]
+                          + [(f"row{i}", tk.END, rows[i]) for i in range(keep_end, new_end)])
+        self._tree_row_cache = rows
+        self._tree_window = (new_start, new_end)
+
+        # Selection and focus are kept by model index; re-apply them to rows that just came back into the tree
+        inserted = itertools.chain(range(new_start, keep_start), range(keep_end, new_end))
+        reselect = [f"row{i}" for i in inserted if i in self._selected_rows]
+        if reselect:
+            self.sequence_tree.selection_add(*reselect)
+        if self._focus_row is not None and (new_start <= self._focus_row < keep_start
+                                            or keep_end <= self._focus_row < new_end):
+            self.sequence_tree.focus(f"row{self._focus_row}")
+
+        if bulk:
+            self.sequence_tree.pack(**pack_info)
+
+    def _bulk_insert(self, items):
+        """ Insert (iid, index, values) rows into the sequence tree in order, with one Tcl call for all of them. """
+        if not items:
+            return
+        tree = self.sequence_tree
+        # Run the loop in an apply lambda so its variables are local to it rather than Tcl globals
+        tree.tk.call('apply', ('rows', f'foreach {{iid index values}} $rows '
+                                       f'{{{tree._w} insert {{}} $index -id $iid -values $values}}'),
+                     tuple(itertools.chain.from_iterable(items)))
+
+    def _tree_index(self, iid):
+        return int(iid[3:])
+
+    def _on_tree_select(self, event=None):
+        """ Track the selection by model index; rows outside the inserted window keep their selected state. """
+        start, end = self._tree_window
+        visible_selected = {self._tree_index(iid) for iid in self.sequence_tree.selection()}
+        self._selected_rows = {i for i in self._selected_rows if not start <= i < end} | visible_selected
+        focus = self.sequence_tree.focus()
+        if focus:
+            self._focus_row = self._tree_index(focus)
+
+    def _on_tree_click(self, event):
+        # A plain click on a row replaces the selection, including rows that are not inserted right now.
+        # Headings, column separators and empty space leave the selection alone.
+        region = self.sequence_tree.identify_region(event.x, event.y)
+        if not event.state & 0x0005 and region in ('cell', 'tree'):  # Shift, Control
+            self._drop_hidden_selection()
+
+    def _on_tree_key(self, event):
+        # Up/Down move the selection to the neighbouring row, replacing it. With Shift or Control they only
+        # extend it where Treeview has a binding for that (Tk 8.6 has none and replaces either way).
+        tree = self.sequence_tree
+        modifier = 'Shift' if event.state & 0x0001 else 'Control' if event.state & 0x0004 else None
+        if modifier and tree.bind_class('Treeview', f'<{modifier}-{event.keysym}>'):
+            return
+        focus = tree.focus()
+        neighbour = tree.prev if event.keysym == 'Up' else tree.next
+        if focus and neighbour(focus):
+            self._drop_hidden_selection()
+
+    def _drop_hidden_selection(self):
+        """ Forget the selected rows outside the inserted window; the next <<TreeviewSelect>> sets the rest. """
+        start, end = self._tree_window
+        self._selected_rows = {i for i in self._selected_rows if start <= i < end}
+
+    def _on_tree_configure(self, event):
+        # Rows have a fixed height, so the viewport capacity follows from the widget height (less the heading)
+        self._tree_visible_count = max(1, event.height // self._tree_row_height - 1)
+
+    def _tree_first_visible(self):
+        start, end = self._tree_window
+        if end <= start:
+            return 0
+        return start + int(round(self._tree_top_fraction * (end - start)))
+
+    def _tree_visible_rows(self):
+        return self._tree_visible_count
+
+    def _tree_window_for(self, first, total):
+        # Clamped top row and the (start, end) rows to keep inserted around it
+        if total <= self.TREE_VIRTUAL_THRESHOLD:
+            return min(first, total), 0, total
+        visible = self._tree_visible_rows()
+        first = max(0, min(first, total - visible))
+        end = min(total, first + visible + self.TREE_WINDOW_BUFFER)
+        return first, max(0, first - self.TREE_WINDOW_BUFFER), end
+
+    def _recenter_tree_window(self, first=None):
+        # Re-slice the inserted rows around model row `first` (default: the top row)
+        self._tree_recenter_pending = False
+        if first is None:
+            first = self._tree_first_visible()
+        first, start, end = self._tree_window_for(first, len(self._tree_row_cache))
+        if (start, end) != self._tree_window:
+            self._apply_tree_window(self._tree_row_cache, start, end)
+        if end > start:
+            self._tree_top_fraction = (first - start) / (end - start)
+            self.sequence_tree.yview_moveto(self._tree_top_fraction)
+
+    def _show_tree_row(self, i):
+        start, end = self._tree_window
+        if not start <= i < end:
+            self._recenter_tree_window(i)
+        self.sequence_tree.see(f"row{i}")
+
+    def _on_tree_yscroll(self, top, bottom):
+        # Map the fractions of the inserted rows onto the whole sequence
+        top, bottom = float(top), float(bottom)
+        self._tree_top_fraction = top
+        start, end = self._tree_window
+        total = len(self._tree_row_cache)
+        if end <= start or total <= self.TREE_VIRTUAL_THRESHOLD:
+            self._tree_vsb.set(top, bottom)
+            return
+        n = end - start
+        self._tree_vsb.set((start + top * n) / total, (start + bottom * n) / total)
+        # Slide the window before the viewport reaches its edge (deferred, Tk is mid-redraw)
+        margin = self.TREE_WINDOW_BUFFER // 2
+        near_edge = (start > 0 and top * n < margin) or (end < total and (1.0 - bottom) * n < margin)
+        if near_edge and not self._tree_recenter_pending:
+            self._tree_recenter_pending = True
+            self.after_idle(self._recenter_tree_window)
+
+    def _on_tree_vsb(self, *args):
+        # Scrollbar positions are fractions of the whole sequence
+        total = len(self._tree_row_cache)
+        if total <= self.TREE_VIRTUAL_THRESHOLD:
+            self.sequence_tree.yview(*args)
+            return
+        if args[0] == 'moveto':
+            first = int(float(args[1]) * total)
         else:
-            command_interval = self.RAMP_STEP_INTERVAL_S
-
-        time_points, rpm_points = [0], [0]
-        cycle_spans, phase_markers, phase_directions = [], [], []
-        current_rpm, elapsed_time_s = 0.0, 0.0
-        pc, cycle_counters, iterations, max_iterations = 0, {}, 0, 10000
-
-        sequence_copy = [dict(s) for s in sequence_data]
-        for i, step in enumerate(sequence_copy): step['original_index'] = i
-
-        while pc < len(sequence_copy) and iterations < max_iterations:
-            instruction = sequence_copy[pc]
+            step = self._tree_visible_rows() if args[2] == 'pages' else 1
+            first = self._tree_first_visible() + int(args[1]) * step
+        self._recenter_tree_window(first)
+
+    def _get_preview_figure(self):
+        """ Return the (figure, axes) pair shared by all confirmation dialogs, creating it on first use. """
+        if self._preview_fig is None:
+            self._preview_fig = Figure(figsize=(8, 5), dpi=100, layout='constrained')
+            self._preview_fig.get_layout_engine().set(w_pad=0.1, h_pad=0.1)
+            self._preview_ax = self._preview_fig.add_subplot(111)
+        return self._preview_fig, self._preview_ax
+
+    def _get_plan_interval(self):
+        pump_controller = getattr(self, "pump_controller", None)
+        if pump_controller:
+            return pump_controller.command_interval
+        return self.RAMP_STEP_INTERVAL_S
+
+    def _get_cached_sequence_data(self, sequence_data):
+        """ Memoized _get_expanded_sequence_data, keyed on the sequence content and the command interval.
+
+        The returned dict is shared between callers and must not be modified.
+        """
+        key = hashlib.blake2b(json.dumps([sequence_data, self._get_plan_interval()], sort_keys=True).encode(),
+                              digest_size=16).digest()
+        plot_data = self._expanded_cache.get(key)
+        if plot_data is None:
+            plot_data = self._expanded_cache[key] = self._get_expanded_sequence_data(sequence_data)
+        return plot_data
+
+    def _expand_to_phase_list(self, sequence, max_iterations=None):
+        # The program as a list, plus the (start, end) phase positions of each completed cycle
+        cycle_bounds = []
+        program = list(self._iter_phase_program(sequence, max_iterations, cycle_bounds))
+        return program, cycle_bounds
+
+    def _iter_phase_program(self, sequence, max_iterations=None, cycle_bounds=None):
+        # Yields (step_index, phase, None) per phase and (step_index, None, log message) per cycle jump
+        cycle_counters = {}
+        pc, iterations, num_phases = 0, 0, 0
+        while pc < len(sequence) and (max_iterations is None or iterations < max_iterations):
+            instruction = sequence[pc]
             if instruction['type'] == 'Phase':
-                phase_markers.append(
-                    {
-                        "time": elapsed_time_s,
-                        "rpm": current_rpm,
-                        "step": instruction["original_index"] + 1,
-                    }
-                )
-
-                duration_s = instruction["duration"]
-                if instruction["unit"] == "min":
-                    duration_s *= 60
-                elif instruction["unit"] == "hr":
-                    duration_s *= 3600
-
-                # Store the end time of this phase including the final command delay
-                phase_directions.append(
-                    {
-                        "end_time": elapsed_time_s + duration_s + command_interval,
-                        "direction": instruction["direction"],
-                    }
-                )
-
-                target_rpm = instruction["rpm"]
-
-                if instruction["mode"] == "Fixed":
-                    if current_rpm != target_rpm:
-                        time_points.append(elapsed_time_s)
-                        rpm_points.append(target_rpm)
-
-                elif instruction["mode"] == "Ramp":
-                    num_steps = int(duration_s / command_interval) if duration_s > 0 else 1
-                    rpm_increment = (target_rpm - current_rpm) / num_steps
-                    for i in range(num_steps):
-                        time_points.append(elapsed_time_s + (i + 1) * command_interval)
-                        rpm_points.append(current_rpm + (i + 1) * rpm_increment)
-
-                elapsed_time_s += duration_s + command_interval
-                time_points.append(elapsed_time_s)
-                rpm_points.append(target_rpm)
-                current_rpm = target_rpm
+                yield (pc, instruction, None)
+                num_phases += 1
                 pc += 1
 
             elif instruction['type'] == 'Cycle':
-                start_idx, end_idx, repeats = instruction['start_phase'] - 1, instruction['end_phase'] - 1, instruction[
-                    'repeats']
-                if not (0 <= start_idx <= end_idx < len(sequence_copy)): break
-
-                if pc not in cycle_counters: cycle_counters[pc] = {'count': repeats, 'start_time': -1}
+                start_idx, end_idx = instruction['start_phase'] - 1, instruction['end_phase'] - 1
+                if not (0 <= start_idx <= end_idx < len(sequence)):
+                    yield (pc, None, f"Error: Invalid phase range in Cycle at step {pc + 1}. Aborting.")
+                    break
 
-                if cycle_counters[pc]['count'] > 0:
-                    if cycle_counters[pc]['start_time'] == -1:
-                        cycle_counters[pc]['start_time'] = elapsed_time_s
+                # [repeats left, phase position where the cycle first jumped back]
+                if pc not in cycle_counters: cycle_counters[pc] = [instruction['repeats'], -1]
+                counter = cycle_counters[pc]
 
-                    cycle_counters[pc]['count'] -= 1
+                if counter[0] > 0:
+                    if counter[1] == -1:
+                        counter[1] = num_phases
+                    yield (pc, None, f"Cycle at step {pc + 1}: {counter[0]} repeats left. "
+                                   f"Jumping to step {start_idx + 1}.")
+                    counter[0] -= 1
                     pc = start_idx
                 else:
-                    cycle_start_time = cycle_counters[pc]['start_time']
-                    if cycle_start_time != -1:
-                        cycle_spans.append((cycle_start_time, elapsed_time_s))
+                    if counter[1] != -1 and cycle_bounds is not None:
+                        cycle_bounds.append((counter[1], num_phases))
+                    yield (pc, None, f"Cycle at step {pc + 1} finished. Continuing.")
                     del cycle_counters[pc]
                     pc += 1
             iterations += 1
 
+    def _get_expanded_sequence_data(self, sequence_data):
+        command_interval = self._get_plan_interval()
+        if np is None:
+            program, cycle_bounds = self._expand_to_phase_list(sequence_data, max_iterations=10000)
+            phase_steps = [step_index for step_index, phase, _ in program if phase is not None]
+            return self._expand_phases_slow(phase_steps, cycle_bounds, sequence_data, command_interval)
+        if (sequence_data is self.sequence_data and self._seq_duration is not None
+                and len(self._seq_duration) == len(sequence_data)):
+            arrays = self._seq_duration, self._seq_rpm, self._seq_dir, self._seq_ramp
+        else:
+            arrays = self._sequence_arrays(sequence_data)
+
+        # Step index of every executed phase; without cycles the steps simply run in order
+        if not any(step['type'] == 'Cycle' for step in sequence_data):
+            phase_steps, cycle_bounds = np.arange(min(len(sequence_data), 10000)), []
+        else:
+            program, cycle_bounds = self._expand_to_phase_list(sequence_data, max_iterations=10000)
+            phase_steps = np.fromiter((step_index for step_index, phase, _ in program if phase is not None),
+                                      dtype=np.intp)
+        return self._expand_phases_fast(phase_steps, cycle_bounds, arrays, command_interval)
+
+    def _sequence_arrays(self, sequence_data):
+        # (duration in s, target rpm, is Forward, is Ramp) per step; cycle steps get zeros
+        phases = [step if step['type'] == 'Phase' else None for step in sequence_data]
+        durations = np.array([step['duration'] * _UNIT_TO_SEC.get(step['unit'], 1) if step else 0.0
+                              for step in phases], dtype=np.float64)
+        rpms = np.array([step['rpm'] if step else 0.0 for step in phases], dtype=np.float64)
+        forward = np.array([bool(step) and step['direction'] == 'Forward' for step in phases], dtype=np.int8)
+        ramp = np.array([bool(step) and step['mode'] == 'Ramp' for step in phases], dtype=bool)
+        return durations, rpms, forward, ramp
+
+    def _expand_phases_fast(self, phase_steps, cycle_bounds, arrays, command_interval):
+        # Each phase adds a block of points: the jump to a new fixed speed (if any), its ramp steps, its end
+        seq_duration, seq_rpm, seq_dir, seq_ramp = arrays
+        num_phases = len(phase_steps)
+        durations = seq_duration[phase_steps]
+        target_rpms = seq_rpm[phase_steps]
+        is_ramp = seq_ramp[phase_steps]
+        start_rpms = np.zeros(num_phases, dtype=np.float64)
+        start_rpms[1:] = target_rpms[:-1]
+
+        if command_interval > 0:
+            ramp_steps = np.maximum(1, (durations / command_interval).astype(np.int64))
+            ramp_steps[durations <= 0] = 1
+        else:
+            ramp_steps = np.ones(num_phases, dtype=np.int64)
+        num_steps = np.where(is_ramp, ramp_steps, 0)
+        fixed_jump = ~is_ramp & (start_rpms != target_rpms)
+        counts = fixed_jump + num_steps + 1
+
+        # phase_start_times[k] is when executed phase k starts; the extra last entry is the end of the plan
+        phase_start_times = np.zeros(num_phases + 1, dtype=np.float64)
+        np.cumsum(durations + command_interval, out=phase_start_times[1:])
+        start_times, end_times = phase_start_times[:-1], phase_start_times[1:]
+        rpm_increments = (target_rpms - start_rpms) / np.maximum(num_steps, 1)
+
+        # Position of every point inside its phase's block
+        block_starts = np.cumsum(counts) - counts
+        position = np.arange(int(counts.sum())) - np.repeat(block_starts, counts)
+        phase_of = np.repeat(np.arange(num_phases), counts)
+        is_end = position == counts[phase_of] - 1
+        ramp_point = is_ramp[phase_of] & ~is_end
+        step = position + 1.0
+
+        time_points = np.empty(len(position) + 1, dtype=np.float64)
+        rpm_points = np.empty(len(position) + 1, dtype=np.float64)
+        time_points[0] = rpm_points[0] = 0.0
+        time_points[1:] = np.where(is_end, end_times[phase_of],
+                                   np.where(ramp_point, step * command_interval + start_times[phase_of],
+                                            start_times[phase_of]))
+        rpm_points[1:] = np.where(ramp_point, step * rpm_increments[phase_of] + start_rpms[phase_of],
+                                  target_rpms[phase_of])
+
+        cycle_spans = [(phase_start_times[start], phase_start_times[end]) for start, end in cycle_bounds]
+
+        return {'time_points': time_points, 'rpm_points': rpm_points, 'cycle_spans': cycle_spans,
+                'marker_times': start_times, 'marker_rpms': start_rpms,
+                'marker_steps': np.asarray(phase_steps, dtype=np.int64) + 1,
+                'direction_end_times': start_times + durations + command_interval,
+                'directions': [('Backward', 'Forward')[d] for d in seq_dir[phase_steps].tolist()]}
+
+    def _expand_phases_slow(self, phase_steps, cycle_bounds, sequence_data, command_interval):
+        """ Same plan as _expand_phases_fast, built point by point with plain lists when NumPy is missing. """
+        time_points, rpm_points = [0.0], [0.0]
+        start_times, start_rpms, direction_end_times, directions = [], [], [], []
+        current_time, current_rpm = 0.0, 0.0
+        for step_index in phase_steps:
+            phase = sequence_data[step_index]
+            duration = phase['duration'] * _UNIT_TO_SEC.get(phase['unit'], 1)
+            target_rpm = phase['rpm']
+            start_times.append(current_time); start_rpms.append(current_rpm)
+            if phase['mode'] == 'Ramp':
+                num_steps = max(1, int(duration / command_interval)) if command_interval > 0 and duration > 0 else 1
+                increment = (target_rpm - current_rpm) / num_steps
+                for step in range(1, num_steps + 1):
+                    time_points.append(current_time + step * command_interval)
+                    rpm_points.append(current_rpm + step * increment)
+            elif target_rpm != current_rpm:
+                time_points.append(current_time); rpm_points.append(target_rpm)
+            current_time += duration + command_interval
+            current_rpm = target_rpm
+            time_points.append(current_time); rpm_points.append(target_rpm)
+            direction_end_times.append(current_time)
+            directions.append(phase['direction'])
+
+        phase_start_times = start_times + [current_time]
+        cycle_spans = [(phase_start_times[start], phase_start_times[end]) for start, end in cycle_bounds]
         return {'time_points': time_points, 'rpm_points': rpm_points, 'cycle_spans': cycle_spans,
-                'phase_markers': phase_markers, 'phase_directions': phase_directions}
+                'marker_times': start_times, 'marker_rpms': start_rpms,
+                'marker_steps': [step_index + 1 for step_index in phase_steps],
+                'direction_end_times': direction_end_times, 'directions': directions}
 
     def _get_total_sequence_time(self):
-        # Use the pre-calculated plan if it exists
-        if hasattr(self, 'plan_time_points') and self.plan_time_points:
-            return self.plan_time_points[-1]
-
-        plot_data = self._get_expanded_sequence_data(self.sequence_data)
-        return plot_data['time_points'][-1] if plot_data['time_points'] else 0.0
+        plot_data = self._get_cached_sequence_data(self.sequence_data)
+        return plot_data['time_points'][-1] if len(plot_data['time_points']) else 0.0
 
     def _run_sequence(self):
         if not self.sequence_data: messagebox.showwarning("Warning", "Sequence is empty. Cannot execute."); return
@@ -655,11 +1190,17 @@ class PumpControlUI(tk.Tk):
             return
 
         # Pre-calculate and store the entire plan
-        self.plot_data = self._get_expanded_sequence_data(self.sequence_data)
+        self.plot_data = self._get_cached_sequence_data(self.sequence_data)
         self.plan_time_points = self.plot_data['time_points']
         self.plan_rpm_points = self.plot_data['rpm_points']
-        self.plan_directions = self.plot_data['phase_directions']
-        self.total_sequence_time = self.plan_time_points[-1] if self.plan_time_points else 0.0
+        self.plan_direction_end_times = self.plot_data['direction_end_times']
+        self.plan_directions = self.plot_data['directions']
+        # Add tolerance for float comparison
+        if np is not None:
+            self._direction_search_times = self.plan_direction_end_times + 0.001
+        else:
+            self._direction_search_times = [t + 0.001 for t in self.plan_direction_end_times]
+        self.total_sequence_time = self.plan_time_points[-1] if len(self.plan_time_points) else 0.0
 
         if self.total_sequence_time < 120:
             self.time_unit = 's'
@@ -671,8 +1212,10 @@ class PumpControlUI(tk.Tk):
             self.time_unit = 'hr'
             self.time_factor = 1.0 / 3600.0
 
-        self._prepare_live_plot()
-        self.notebook.select(self.live_plot_tab)
+        # Switching tabs resizes the canvas, so let that and the new plan share one redraw
+        with self._defer_draw():
+            self._prepare_live_plot()
+            self.notebook.select(self.live_plot_tab)
 
         self.stop_event.clear()
         self.sequence_is_running = True
@@ -681,50 +1224,41 @@ class PumpControlUI(tk.Tk):
         with self.state_lock:
             self.current_step_num = 0
             self.last_plot_point = (0, 0)
+        self._plan_cursor = 0
+        self.progress_bar['maximum'] = self.total_sequence_time if self.total_sequence_time > 0 else 1
+        self._progress_state = {}
 
-        self.sequence_thread = threading.Thread(target=self._sequence_worker, args=(self.sequence_data[:],),
-                                                daemon=True)
+        # Uncapped, unlike the plan; unrolled lazily by the worker thread
+        program = self._iter_phase_program(list(self.sequence_data))
+        self.sequence_thread = threading.Thread(target=self._sequence_worker, args=(program,), daemon=True)
         self.sequence_thread.start()
+        self._ui_queue = queue.Queue(maxsize=2)
+        self._ticker_thread = threading.Thread(target=self._plan_ticker, daemon=True)
+        self._ticker_thread.start()
 
         self.run_seq_btn.config(state=tk.DISABLED);
         self.stop_seq_btn.config(state=tk.NORMAL)
 
-        self.after(self.UPDATE_INTERVAL_MS, self._periodic_updater)
+        self._next_tick_mono = time.perf_counter()
+        self._schedule_next_tick()
+        self._live_flush_job = self.after(int(1000 / self.max_redraw_rate_hz), self._flush_live_plot)
 
-    def _sequence_worker(self, sequence):
+    def _sequence_worker(self, program):
+        # Cycles are already unrolled in the program
         self._log("Sequence started...")
-        self.progress_bar['maximum'] = self.total_sequence_time if self.total_sequence_time > 0 else 1
-
-        pc = 0
-        cycle_counters = {}
 
         # This is now the source of truth for the worker's current RPM state
         current_rpm = 0.0
 
-        while pc < len(sequence) and not self.stop_event.is_set():
+        for step_index, phase, message in program:
+            if self.stop_event.is_set(): break
             with self.state_lock:
-                self.current_step_num = pc + 1
+                self.current_step_num = step_index + 1
 
-            instruction = sequence[pc]
-            if instruction['type'] == 'Phase':
-                # The worker now tracks its own RPM state internally
-                current_rpm = self._execute_phase(instruction, current_rpm)
-                pc += 1
-            elif instruction['type'] == 'Cycle':
-                start_idx, end_idx = instruction['start_phase'] - 1, instruction['end_phase'] - 1
-                if not (0 <= start_idx <= end_idx < len(sequence)):
-                    self._log(f"Error: Invalid phase range in Cycle at step {pc + 1}. Aborting.");
-                    break
-                if pc not in cycle_counters: cycle_counters[pc] = instruction['repeats']
-                if cycle_counters[pc] > 0:
-                    self._log(
-                        f"Cycle at step {pc + 1}: {cycle_counters[pc]} repeats left. Jumping to step {start_idx + 1}.")
-                    cycle_counters[pc] -= 1;
-                    pc = start_idx
-                else:
-                    self._log(f"Cycle at step {pc + 1} finished. Continuing.")
-                    del cycle_counters[pc];
-                    pc += 1
+            if phase is None:
+                self._log(message)
+            else:
+                current_rpm = self._execute_phase(phase, current_rpm)
 
         if not self.stop_event.is_set():
             self._log("Sequence finished. Stopping pump.")
@@ -740,33 +1274,40 @@ class PumpControlUI(tk.Tk):
         else:
             self.pump_controller.start_backward()
 
-        duration_s = phase['duration']
-        if phase['unit'] == 'min':
-            duration_s *= 60
-        elif phase['unit'] == 'hr':
-            duration_s *= 3600
+        duration_s = phase['duration'] * _UNIT_TO_SEC.get(phase['unit'], 1)
 
         target_rpm = phase['rpm']
         phase_start_time = time.perf_counter()
 
-        if phase['mode'] == 'Fixed':
+        mode = phase['mode']
+        # A ramp whose ends fall within the pump's 0.01 RPM resolution is just a fixed phase
+        if mode == 'Ramp' and abs(target_rpm - start_rpm) < 0.01:
+            mode = 'Fixed'
+
+        if mode == 'Fixed':
             self.pump_controller.set_speed(target_rpm)
-            end_time = phase_start_time + duration_s
-            while time.perf_counter() < end_time:
-                if self.stop_event.is_set(): break
-                self.stop_event.wait(0.05)
+            # wait() returns early (True) when Stop is pressed, so no polling loop is needed
+            self.stop_event.wait(duration_s)
+            return target_rpm
 
-        elif phase['mode'] == 'Ramp':
+        # Quantized the same way as set_speed; steps that round to the last sent value are skipped
+        last_sent_key = None
+        if mode == 'Ramp':
+            interval_s = self.pump_controller.command_interval
             time_in_phase = 0
             while time_in_phase < duration_s:
-                if self.stop_event.is_set(): break
                 ramp_fraction = time_in_phase / duration_s if duration_s > 0 else 1.0
                 current_rpm_in_phase = start_rpm + (target_rpm - start_rpm) * ramp_fraction
-                self.pump_controller.set_speed(current_rpm_in_phase)
+                key = int(current_rpm_in_phase * 100)
+                if key != last_sent_key:
+                    self.pump_controller.set_speed(current_rpm_in_phase)
+                    last_sent_key = key
+                if self.stop_event.wait(interval_s): break
                 time_in_phase = time.perf_counter() - phase_start_time
 
         if not self.stop_event.is_set():
-            self.pump_controller.set_speed(target_rpm)
+            if int(target_rpm * 100) != last_sent_key:
+                self.pump_controller.set_speed(target_rpm)
             # Wait for any remaining time in the phase to ensure total duration is accurate
             remaining_time = duration_s - (time.perf_counter() - phase_start_time)
             if remaining_time > 0:
@@ -774,54 +1315,136 @@ class PumpControlUI(tk.Tk):
             return target_rpm
         else:
             final_elapsed_in_phase = time.perf_counter() - phase_start_time
-            if phase['mode'] == 'Ramp' and duration_s > 0:
+            if mode == 'Ramp' and duration_s > 0:
                 ramp_fraction = min(1.0, final_elapsed_in_phase / duration_s)
                 return start_rpm + (target_rpm - start_rpm) * ramp_fraction
             else:
                 return target_rpm
 
-    def _periodic_updater(self):
-        if not self.sequence_is_running:
-            return
+    def _plan_ticker(self):
+        """ Runs beside the sequence worker and computes each UI tick's state off the Tk thread. """
+        interval_s = self.UPDATE_INTERVAL_MS / 1000.0
+        while self.sequence_is_running and self._ticker_thread is threading.current_thread():
+            elapsed_time = time.perf_counter() - self.sequence_start_time
 
-        elapsed_time = time.perf_counter() - self.sequence_start_time
+            # Ensure plot doesn't run past the end time
+            if elapsed_time >= self.total_sequence_time:
+                elapsed_time = self.total_sequence_time
 
-        # Ensure plot doesn't run past the end time
-        if elapsed_time >= self.total_sequence_time:
-            elapsed_time = self.total_sequence_time
+            planned_rpm, planned_direction = self._planned_state_at(elapsed_time)
 
-        # Find the correct direction from the pre-calculated plan
-        planned_direction = "Forward"  # Default
-        if hasattr(self, 'plan_directions') and self.plan_directions:
-            for phase_info in self.plan_directions:
-                if elapsed_time <= phase_info['end_time'] + 0.001:  # Add tolerance for float comparison
-                    planned_direction = phase_info['direction']
+            with self.state_lock:
+                step_num = self.current_step_num
+
+            step_text, time_text = self._format_progress(step_num, elapsed_time, self.total_sequence_time)
+            state = {'elapsed': elapsed_time, 'rpm': planned_rpm, 'direction': planned_direction,
+                     'step_text': step_text, 'time_text': time_text}
+            # If the UI falls behind, drop the oldest state rather than block
+            while True:
+                try:
+                    self._ui_queue.put_nowait(state)
                     break
+                except queue.Full:
+                    try:
+                        self._ui_queue.get_nowait()
+                    except queue.Empty:
+                        pass
 
-        with self.state_lock:
-            step_num = self.current_step_num
-
-        if self.plan_time_points:
-            planned_rpm = np.interp(elapsed_time, self.plan_time_points, self.plan_rpm_points)
-        else:
-            planned_rpm = 0
+            if self.stop_event.wait(interval_s):
+                break
 
-        self._update_progress(step_num, elapsed_time, self.total_sequence_time)
-        self._update_live_plot(elapsed_time * self.time_factor, planned_rpm, planned_direction)
+    def _periodic_updater(self):
+        if not self.sequence_is_running:
+            return
 
-        # Continue updating as long as the sequence is marked as running
+        # The ticker thread has already done the plan lookups; only push its results into the widgets
+        state = None
+        px_per_x, px_per_rpm = self._live_px_per_unit()
+        while True:
+            try:
+                state = self._ui_queue.get_nowait()
+            except queue.Empty:
+                break
+            time_scaled = state['elapsed'] * self.time_factor
+            last_time, last_rpm = self.last_plot_point
+            # On long runs most ticks move the trace by less than a pixel; those would redraw for nothing
+            if (state['direction'] == self._last_plot_direction and abs(time_scaled - last_time) * px_per_x < 1.0
+                    and abs(state['rpm'] - last_rpm) * px_per_rpm < 1.0):
+                continue
+            self._update_live_plot(time_scaled, state['rpm'], state['direction'])
+        if state:
+            self._show_progress(state['elapsed'], state['step_text'], state['time_text'])
+
+        # Continue updating as long as the sequence is marked as running. Ticks are scheduled against
+        # perf_counter deadlines so the time spent in this callback does not stretch the period.
         if self.sequence_is_running:
-            self.after(self.UPDATE_INTERVAL_MS, self._periodic_updater)
+            self._schedule_next_tick()
+
+    def _schedule_next_tick(self):
+        now = time.perf_counter()
+        self._next_tick_mono += self.UPDATE_INTERVAL_MS / 1000
+        if self._next_tick_mono < now:
+            # Fell behind (e.g. a stalled event loop): skip the missed ticks instead of bursting to catch up
+            self._next_tick_mono = now
+        self.after(max(0, int((self._next_tick_mono - now) * 1000)), self._periodic_updater)
+
+    def _planned_state_at(self, elapsed_time):
+        """ Planned (rpm, direction) at elapsed_time, read from the pre-calculated plan.
+
+        Elapsed time only grows during a run, so the cursor into the plan points is advanced from where the
+        previous call stopped instead of searching the whole plan every tick. _run_sequence resets it.
+        """
+        time_points, rpm_points = self.plan_time_points, self.plan_rpm_points
+        planned_rpm = 0
+        if len(time_points):
+            c = self._plan_cursor
+            while c + 1 < len(time_points) and time_points[c + 1] <= elapsed_time:
+                c += 1
+            self._plan_cursor = c
+            # Linear interpolation, matching np.interp
+            if c + 1 < len(time_points) and elapsed_time > time_points[c]:
+                slope = (rpm_points[c + 1] - rpm_points[c]) / (time_points[c + 1] - time_points[c])
+                planned_rpm = rpm_points[c] + (elapsed_time - time_points[c]) * slope
+            else:
+                planned_rpm = rpm_points[c]
 
-    def _update_progress(self, current_step_num, elapsed_time, total_time):
-        self.progress_bar['value'] = elapsed_time
+        # Find the correct direction from the pre-calculated plan: the first phase still running at elapsed_time
+        planned_direction = "Forward"  # Default
+        idx = 0
+        if len(self.plan_directions):
+            search = np.searchsorted if np is not None else bisect.bisect_left
+            idx = search(self._direction_search_times, elapsed_time)
+        if idx < len(self.plan_directions):
+            planned_direction = self.plan_directions[idx]
+        return planned_rpm, planned_direction
+
+    def _format_progress(self, current_step_num, elapsed_time, total_time):
         et_m, et_s = divmod(int(elapsed_time), 60)
         tt_m, tt_s = divmod(int(total_time), 60)
 
         if current_step_num > len(self.sequence_data): current_step_num = len(self.sequence_data)
 
-        self.progress_step_label.config(text=f"Current Step: {current_step_num}/{len(self.sequence_data)}")
-        self.progress_time_label.config(text=f"Time: {et_m:02d}:{et_s:02d} / {tt_m:02d}:{tt_s:02d}")
+        return (f"Current Step: {current_step_num}/{len(self.sequence_data)}",
+                f"Time: {et_m:02d}:{et_s:02d} / {tt_m:02d}:{tt_s:02d}")
+
+    def _show_progress(self, elapsed_time, step_text, time_text):
+        # The labels change about once a second and a 0.1% step of the bar is under a pixel at usual window sizes,
+        # so most ticks need no Tcl call at all
+        bar_max = self.total_sequence_time if self.total_sequence_time > 0 else 1
+        state = self._progress_state
+        permille = int(elapsed_time * 1000 / bar_max)
+        if state.get('permille') != permille:
+            self.progress_bar['value'] = elapsed_time
+            state['permille'] = permille
+        if state.get('step') != step_text:
+            self.progress_step_label.config(text=step_text)
+            state['step'] = step_text
+        if state.get('time') != time_text:
+            self.progress_time_label.config(text=time_text)
+            state['time'] = time_text
+
+    def _update_progress(self, current_step_num, elapsed_time, total_time):
+        self._show_progress(elapsed_time, *self._format_progress(current_step_num, elapsed_time, total_time))
 
     def _on_sequence_finish(self):
         if not self.sequence_is_running: return  # Prevent double-calls
@@ -832,9 +1455,12 @@ class PumpControlUI(tk.Tk):
 
         # Final plot update to ensure it reaches the very end
         if hasattr(self, 'plan_directions') and self.plan_directions:
-            final_rpm = self.plan_rpm_points[-1] if self.plan_rpm_points else 0
-            final_direction = self.plan_directions[-1]['direction'] if self.plan_directions else "Forward"
+            final_rpm = self.plan_rpm_points[-1] if len(self.plan_rpm_points) else 0
+            final_direction = self.plan_directions[-1] if self.plan_directions else "Forward"
             self._update_live_plot(self.total_sequence_time * self.time_factor, final_rpm, final_direction)
+        if self._live_flush_job:
+            self.after_cancel(self._live_flush_job)
+        self._flush_live_plot(reschedule=False)
 
         self._update_progress(len(self.sequence_data), self.total_sequence_time, self.total_sequence_time)
         if self.live_ax: self.live_canvas.draw_idle()
@@ -849,8 +1475,12 @@ class PumpControlUI(tk.Tk):
         filepath = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON Sequence Files", "*.json")])
         if not filepath: return
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(self.sequence_data, f, indent=4)
+            if orjson:
+                data = orjson.dumps(self.sequence_data, option=orjson.OPT_INDENT_2)
+            else:
+                data = json.dumps(self.sequence_data, indent=2).encode('utf-8')
+            with open(filepath, 'wb') as f:
+                f.write(data)
             self._log(f"Sequence saved to: {filepath}")
         except Exception as e:
             messagebox.showerror("Save Failed", f"Could not save file: {e}")
@@ -859,9 +1489,10 @@ class PumpControlUI(tk.Tk):
         filepath = filedialog.askopenfilename(filetypes=[("JSON Sequence Files", "*.json")])
         if not filepath: return
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                self.sequence_data = json.load(f)
-            self._update_treeview()
+            with open(filepath, 'rb') as f:
+                data = f.read()
+            self.sequence_data = orjson.loads(data) if orjson else json.loads(data)
+            self._on_sequence_changed()
             self._log(f"Sequence loaded from: {filepath}")
         except Exception as e:
             messagebox.showerror("Load Failed", f"Could not load file: {e}")
@@ -871,7 +1502,14 @@ class PumpControlUI(tk.Tk):
         self.sequence_is_running = False
         if self.pump_controller and self.pump_controller.is_connected:
             if messagebox.askyesno("Exit", "The pump is still connected. Do you want to disconnect before exiting?"):
-                self._disconnect_pump()
+                # The window stays up until the port is released, then closes from the disconnect callback
+                self.protocol("WM_DELETE_WINDOW", lambda: None)
+                self._disconnect_pump(on_done=self._finish_closing)
+                return
+        self._finish_closing()
+
+    def _finish_closing(self):
+        self._render_pool.shutdown(wait=False)
         self.destroy()
 
     def __init__(self):
@@ -879,6 +1517,7 @@ class PumpControlUI(tk.Tk):
         self._setup_theme_and_style()
         self._initialize_variables()
         self._create_widgets()
+        self.after(self.UPDATE_INTERVAL_MS, self._drain_log)
         self.protocol("WM_DELETE_WINDOW", self._on_closing)
 
     def _setup_theme_and_style(self):
@@ -894,15 +1533,56 @@ class PumpControlUI(tk.Tk):
         self.bold_font = font.Font(family="Segoe UI", size=10, weight="bold")
         self.status_font = font.Font(family="Segoe UI", size=9, weight="bold")
         self.style = ttk.Style()
+        # Style lookups are Tcl round-trips; the widgets read these cached values instead
+        self._frame_bg = self.style.lookup('TFrame', 'background')
+        # Treeview rows all share the style's row height (default: one line of the default font)
+        try:
+            self._tree_row_height = max(1, int(self.style.lookup("Treeview", "rowheight")))
+        except (TypeError, ValueError):
+            self._tree_row_height = font.nametofont("TkDefaultFont").metrics("linespace")
         self.style.configure("TLabelframe.Label", font=self.bold_font)
         self.style.configure("Stop.TButton", font=self.bold_font)
         self.style.configure("Run.TButton", font=self.bold_font)
 
+        # Bitmap button icons draw faster and more consistently than emoji run through text shaping
+        self._icons = {}
+        for name in self.BUTTON_ICONS:
+            try:
+                self._icons[name] = tk.PhotoImage(file=resource_path(os.path.join("icons", f"{name}.png")))
+            except tk.TclError:
+                pass
+
+    def _icon_label(self, icon, text, fallback):
+        """ Button keyword arguments showing the named icon left of text, or the fallback text if it is missing. """
+        if icon in self._icons:
+            return {'image': self._icons[icon], 'text': text, 'compound': 'left'}
+        return {'text': fallback}
+
     def _initialize_variables(self):
+        # Lines past LOG_MAX_LINES would be trimmed right away, so a burst between drains never queues more
+        self._log_queue = collections.deque(maxlen=self.LOG_MAX_LINES)
+        self._log_line_count = 0
+        # What the progress widgets currently show; _show_progress only pushes values that changed
+        self._progress_state = {}
         self.pump_controller = None
         self.sequence_thread = None
+        self._ticker_thread = None
+        self._ui_queue = queue.Queue(maxsize=2)
         self.stop_event = threading.Event()
         self.sequence_data = []
+        self._tree_row_cache = []
+        self._tree_window = (0, 0)
+        self._tree_recenter_pending = False
+        self._tree_top_fraction = 0.0
+        self._tree_visible_count = 10
+        self._selected_rows = set()
+        self._focus_row = None
+        self._phase_seconds = []
+        self._phase_seconds_prefix = [0]
+        self._cycle_rows = []
+        # Per-step arrays of sequence_data for the plan expansion
+        self._seq_duration = self._seq_rpm = self._seq_dir = self._seq_ramp = None
+        self._expanded_cache = {}
         self.debug_mode_var = tk.BooleanVar(value=False)
 
         self.state_lock = threading.Lock()
@@ -913,15 +1593,48 @@ class PumpControlUI(tk.Tk):
 
         self.plan_time_points = []
         self.plan_rpm_points = []
+        self.plan_direction_end_times = []
         self.plan_directions = []
+        self._direction_search_times = []
+        self._next_tick_mono = 0.0
+        self._plan_cursor = 0
 
         self.time_unit = 'min'
         self.time_factor = 1.0 / 60.0
 
+        self._preview_fig = None
+        self._preview_ax = None
+
         self.live_fig = None
         self.live_ax = None
         self.live_canvas = None
         self.last_plot_point = (0, 0)
+        self._live_bg = None
+        self._live_bg_fig_bbox = None
+        self._live_lines = {}
+        self._live_trace = {}
+        self._live_trace_direction = None
+        self._live_trace_last = (0, 0)
+        self._last_plot_direction = None
+        self._plan_time_np = None
+        self._plan_time_np_src = None
+        self._plan_time_np_factor = None
+        # Trace points are queued by _update_live_plot in preallocated arrays (created with the live plot) and
+        # drawn in batches by _flush_live_plot; _buf_i is the number of queued points
+        self._buf_t = self._buf_rpm = self._buf_dir = None
+        self._buf_i = 0
+        self._live_flush_job = None
+        self._plan_trace = None
+        self._span_coll = None
+        self._plan_full = None
+        # Live-plot render thread; the lock guards the figure
+        self._render_pool = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self._render_lock = threading.Lock()
+        self._render_future = None
+        self._render_again = False
+        self.max_redraw_rate_hz = 20
+        self._draw_defer_depth = 0
+        self._draw_pending = False
 
     def _create_widgets(self):
         main_frame = ttk.Frame(self, padding="10")
@@ -986,9 +1699,11 @@ class PumpControlUI(tk.Tk):
         self.debug_mode_check = ttk.Checkbutton(frame, text="Debug Mode (No Pump)", variable=self.debug_mode_var)
         self.debug_mode_check.grid(row=3, column=0, columnspan=2, sticky=tk.W, padx=5, pady=(5, 5))
 
-        self.connect_btn = ttk.Button(frame, text="✔ Connect", command=self._connect_pump, style='Accent.TButton')
+        self.connect_btn = ttk.Button(frame, **self._icon_label('connect', "Connect", "✔ Connect"),
+                                      command=self._connect_pump, style='Accent.TButton')
         self.connect_btn.grid(row=4, column=0, pady=5, padx=5, sticky="ew")
-        self.disconnect_btn = ttk.Button(frame, text="✖ Disconnect", command=self._disconnect_pump, state=tk.DISABLED)
+        self.disconnect_btn = ttk.Button(frame, **self._icon_label('disconnect', "Disconnect", "✖ Disconnect"),
+                                         command=self._disconnect_pump, state=tk.DISABLED)
         self.disconnect_btn.grid(row=4, column=1, pady=5, padx=5, sticky="ew")
 
         self.status_label = ttk.Label(frame, text="Status: Disconnected", foreground="#c0392b", font=self.status_font)
@@ -1000,41 +1715,49 @@ class PumpControlUI(tk.Tk):
         speed_frame = ttk.Frame(self.manual_frame)
         speed_frame.pack(fill=tk.X)
         ttk.Label(speed_frame, text="Speed (RPM):").pack(side=tk.LEFT, anchor='w')
-        self.manual_rpm_entry = ttk.Entry(speed_frame, width=6)
+        self._rpm_var = tk.StringVar()
+        self.manual_rpm_entry = ttk.Entry(speed_frame, width=6, textvariable=self._rpm_var)
         self.manual_rpm_entry.pack(side=tk.RIGHT, anchor='e')
         self.manual_rpm_entry.bind("<Return>", self._update_speed_from_entry)
         self.manual_rpm_entry.bind("<FocusOut>", self._update_speed_from_entry)
         self.speed_scale = ttk.Scale(self.manual_frame, from_=0, to=48, orient=tk.HORIZONTAL,
                                      command=self._update_speed_label)
         self.speed_scale.pack(fill=tk.X, pady=2)
+        self._speed_label_text = "0.0"
         self.speed_label = ttk.Label(self.manual_frame, text="0.0 RPM")
         self.speed_label.pack(anchor=tk.W)
         btn_frame = ttk.Frame(self.manual_frame)
         btn_frame.pack(fill=tk.X, pady=(10, 5))
-        self.fwd_btn = ttk.Button(btn_frame, text="▶ Forward", command=self._manual_start_fwd)
+        self.fwd_btn = ttk.Button(btn_frame, **self._icon_label('forward', "Forward", "▶ Forward"),
+                                  command=self._manual_start_fwd)
         self.fwd_btn.pack(side=tk.LEFT, expand=True, fill=tk.X, padx=2)
-        self.rev_btn = ttk.Button(btn_frame, text="◀ Backward", command=self._manual_start_rev)
+        self.rev_btn = ttk.Button(btn_frame, **self._icon_label('backward', "Backward", "◀ Backward"),
+                                  command=self._manual_start_rev)
         self.rev_btn.pack(side=tk.LEFT, expand=True, fill=tk.X, padx=2)
-        self.stop_btn = ttk.Button(self.manual_frame, text="⏹️ STOP", command=self._manual_stop, style="Stop.TButton")
+        self.stop_btn = ttk.Button(self.manual_frame, **self._icon_label('stop', "STOP", "⏹️ STOP"),
+                                   command=self._manual_stop, style="Stop.TButton")
         self.stop_btn.pack(fill=tk.X, pady=(5, 0), ipady=5)
+        # The panel is static, so the widgets toggled on connect/disconnect are collected once here
+        self._manual_state_widgets = [self.manual_rpm_entry, self.speed_scale, self.speed_label, self.fwd_btn,
+                                      self.rev_btn, self.stop_btn]
         self._set_manual_controls_state(tk.DISABLED)
 
     def _create_file_panel(self, parent):
         frame = ttk.LabelFrame(parent, text="Sequence Operations", padding="10")
         frame.pack(fill=tk.X, pady=5, anchor='n')
-        self.save_btn = ttk.Button(frame, text="💾 Save", command=self._save_sequence)
+        self.save_btn = ttk.Button(frame, **self._icon_label('save', "Save", "💾 Save"), command=self._save_sequence)
         self.save_btn.pack(side=tk.LEFT, expand=True, fill=tk.X, padx=2)
-        self.load_btn = ttk.Button(frame, text="📂 Load", command=self._load_sequence)
+        self.load_btn = ttk.Button(frame, **self._icon_label('load', "Load", "📂 Load"), command=self._load_sequence)
         self.load_btn.pack(side=tk.LEFT, expand=True, fill=tk.X, padx=2)
 
     def _create_execution_panel(self, parent):
         frame = ttk.LabelFrame(parent, text="Sequence Execution", padding="10")
         frame.pack(fill=tk.X, pady=5, anchor='n')
-        self.run_seq_btn = ttk.Button(frame, text="▶️ Run Sequence", command=self._run_sequence, state=tk.DISABLED,
-                                      style="Run.TButton")
+        self.run_seq_btn = ttk.Button(frame, **self._icon_label('run', "Run Sequence", "▶️ Run Sequence"),
+                                      command=self._run_sequence, state=tk.DISABLED, style="Run.TButton")
         self.run_seq_btn.pack(fill=tk.X, ipady=5, pady=2)
-        self.stop_seq_btn = ttk.Button(frame, text="⏹️ Stop Sequence", command=self._stop_sequence, state=tk.DISABLED,
-                                       style="Stop.TButton")
+        self.stop_seq_btn = ttk.Button(frame, **self._icon_label('stop', "Stop Sequence", "⏹️ Stop Sequence"),
+                                       command=self._stop_sequence, state=tk.DISABLED, style="Stop.TButton")
         self.stop_seq_btn.pack(fill=tk.X, ipady=5, pady=2)
         progress_frame = ttk.Frame(frame, padding=(0, 5))
         progress_frame.pack(fill=tk.X, expand=True)
@@ -1049,10 +1772,8 @@ class PumpControlUI(tk.Tk):
         frame = ttk.LabelFrame(parent, text="Contact", padding="10")
         frame.pack(fill=tk.X, pady=5, anchor='n')
         contact_widget = tk.Text(frame, height=2, wrap=tk.WORD, relief=tk.FLAT, font=("Segoe UI", 9))
-        try:
-            contact_widget.config(bg=self.style.lookup('TFrame', 'background'))
-        except tk.TclError:
-            pass
+        if self._frame_bg:
+            contact_widget.config(bg=self._frame_bg)
         contact_widget.insert(tk.END, "Any problem or suggestion, contact:\n")
         contact_widget.insert(tk.END, "qiyaolin3776@gmail.com")
         contact_widget.tag_add("email", "2.0", "2.end")
@@ -1067,67 +1788,88 @@ class PumpControlUI(tk.Tk):
         tree_frame.pack(fill=tk.BOTH, expand=True)
         cols = ("#", "Type", "Details", "Duration")
         self.sequence_tree = ttk.Treeview(tree_frame, columns=cols, show="headings")
+        # Configure every heading and column in one Tcl loop instead of two round-trips per column.
+        # The loop runs in an apply lambda so its variables do not end up as Tcl globals.
+        column_specs = []
         for col, width in zip(cols, [40, 80, 400, 120]):
-            self.sequence_tree.heading(col, text=col)
-            self.sequence_tree.column(col, width=width, anchor=tk.W if col == "Details" else tk.CENTER)
+            column_specs += [col, width, int(col == "Details"), tk.W if col == "Details" else tk.CENTER]
+        tree = self.sequence_tree._w
+        self.sequence_tree.tk.call('apply', ('specs', f'foreach {{col width stretch anchor}} $specs {{'
+                                                      f'{tree} heading $col -text $col; '
+                                                      f'{tree} column $col -width $width -stretch $stretch '
+                                                      f'-anchor $anchor}}'),
+                                   tuple(column_specs))
         self.sequence_tree.bind("<Double-1>", self._edit_item)
-        vsb = ttk.Scrollbar(tree_frame, orient="vertical", command=self.sequence_tree.yview)
-        self.sequence_tree.configure(yscrollcommand=vsb.set);
+        self.sequence_tree.bind("<ButtonPress-1>", self._on_tree_click)
+        self.sequence_tree.bind("<KeyPress-Up>", self._on_tree_key)
+        self.sequence_tree.bind("<KeyPress-Down>", self._on_tree_key)
+        self.sequence_tree.bind("<<TreeviewSelect>>", self._on_tree_select)
+        self.sequence_tree.bind("<Configure>", self._on_tree_configure)
+        self._tree_vsb = vsb = ttk.Scrollbar(tree_frame, orient="vertical", command=self._on_tree_vsb)
+        self.sequence_tree.configure(yscrollcommand=self._on_tree_yscroll);
         vsb.pack(side=tk.RIGHT, fill=tk.Y)
         self.sequence_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         editor_controls = ttk.Frame(frame, padding=(0, 10, 0, 0))
         editor_controls.pack(fill=tk.X)
-        ttk.Button(editor_controls, text="➕ Add Phase", command=self._add_phase, style='Accent.TButton').pack(
-            side=tk.LEFT, padx=2)
-        ttk.Button(editor_controls, text="🔄 Add Cycle", command=self._add_cycle, style='Accent.TButton').pack(
-            side=tk.LEFT, padx=2)
-        ttk.Button(editor_controls, text="🗑️ Remove", command=self._remove_item).pack(side=tk.LEFT, padx=(10, 2))
-        ttk.Button(editor_controls, text="❌ Clear All", command=self._clear_sequence).pack(side=tk.LEFT, padx=2)
-        ttk.Button(editor_controls, text="⬆️ Move Up", command=lambda: self._move_item('up')).pack(side=tk.LEFT,
-                                                                                                   padx=(10, 2))
-        ttk.Button(editor_controls, text="⬇️ Move Down", command=lambda: self._move_item('down')).pack(side=tk.LEFT,
-                                                                                                       padx=2)
+        ttk.Button(editor_controls, **self._icon_label('add', "Add Phase", "➕ Add Phase"), command=self._add_phase,
+                   style='Accent.TButton').pack(side=tk.LEFT, padx=2)
+        ttk.Button(editor_controls, **self._icon_label('cycle', "Add Cycle", "🔄 Add Cycle"), command=self._add_cycle,
+                   style='Accent.TButton').pack(side=tk.LEFT, padx=2)
+        ttk.Button(editor_controls, **self._icon_label('remove', "Remove", "🗑️ Remove"),
+                   command=self._remove_item).pack(side=tk.LEFT, padx=(10, 2))
+        ttk.Button(editor_controls, **self._icon_label('clear', "Clear All", "❌ Clear All"),
+                   command=self._clear_sequence).pack(side=tk.LEFT, padx=2)
+        ttk.Button(editor_controls, **self._icon_label('up', "Move Up", "⬆️ Move Up"),
+                   command=lambda: self._move_item('up')).pack(side=tk.LEFT, padx=(10, 2))
+        ttk.Button(editor_controls, **self._icon_label('down', "Move Down", "⬇️ Move Down"),
+                   command=lambda: self._move_item('down')).pack(side=tk.LEFT, padx=2)
 
     def _create_live_plot_panel(self, parent):
         frame = ttk.LabelFrame(parent, text="Live Process Visualization", padding="10")
         frame.pack(fill=tk.BOTH, expand=True, pady=0, padx=0)
 
-        if not (Figure and mlines): return
+        # Importing matplotlib is the slowest part of startup, so build the plot once the main window is up
+        placeholder = ttk.Label(frame, text="Initializing plot…", anchor=tk.CENTER)
+        placeholder.pack(fill=tk.BOTH, expand=True)
+        self.after_idle(self._build_live_plot, frame, placeholder)
+
+    def _build_live_plot(self, frame, placeholder):
+        if not _ensure_plot_libs():
+            placeholder.config(text="Live plot unavailable (matplotlib/numpy not installed)")
+            return
+        placeholder.destroy()
 
-        self.live_fig = Figure(figsize=(5, 4), dpi=100)
+        # Constrained layout is solved as part of each draw, so plan refreshes need no tight_layout() pass
+        self.live_fig = Figure(figsize=(5, 4), dpi=100, layout='constrained')
+        self.live_fig.get_layout_engine().set(w_pad=0.1, h_pad=0.1)  # About the margin of tight_layout(pad=1.5)
         self.live_ax = self.live_fig.add_subplot(111)
 
         self.live_canvas = FigureCanvasTkAgg(self.live_fig, master=frame)
         self.live_canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
-        self._prepare_live_plot()
-
-    def _prepare_live_plot(self):
-        if not self.live_ax: return
-
-        self.live_ax.clear()
-
-        # Use the pre-calculated plan if available, otherwise calculate it
-        if hasattr(self, 'plan_time_points') and self.plan_time_points:
-            plot_data = {'time_points': self.plan_time_points, 'rpm_points': self.plan_rpm_points,
-                         'cycle_spans': self.plot_data['cycle_spans']}
-        else:
-            plot_data = self._get_expanded_sequence_data(self.sequence_data)
-
-        time_scaled = [t * self.time_factor for t in plot_data['time_points']]
-        rpm_data = plot_data['rpm_points']
-
-        self.live_ax.plot(time_scaled, rpm_data, color='lightgray', linestyle='--', label='Plan', zorder=1)
-
-        for span in plot_data.get('cycle_spans', []):
-            self.live_ax.axvspan(span[0] * self.time_factor, span[1] * self.time_factor, color='lightskyblue',
-                                 alpha=0.3, zorder=0)
-
+        self.live_canvas.mpl_connect('draw_event', self._on_live_draw)
+        # Full redraws run on the render thread
+        self.live_canvas.draw = self._render_live_async
+        # Replace the backend's resize handlers with locked ones
+        canvas_widget = self.live_canvas.get_tk_widget()
+        canvas_widget.bind("<Configure>", self._on_live_resize)
+        if hasattr(self.live_canvas, '_update_device_pixel_ratio'):
+            canvas_widget.bind("<Map>", self._on_live_map)
+
+        # The artists are created once; _prepare_live_plot only swaps in the data of each new plan
         self.live_ax.set_title("Real-time Sequence Monitoring", fontsize=14, fontweight='bold')
-        self.live_ax.set_xlabel(f"Time ({self.time_unit})", fontsize=10)
         self.live_ax.set_ylabel("Speed (RPM)", fontsize=10)
         self.live_ax.set_ylim(bottom=-2, top=52)
-        if time_scaled:
-            self.live_ax.set_xlim(left=min(time_scaled) - 0.05 * max(time_scaled), right=max(time_scaled) * 1.05)
+        # The plan is only rasterized into the blit background, but can hold far more points than the axes has
+        # pixels; it is drawn as a collection decimated to the axes width and refreshed on resize
+        self._plan_trace = mcollections.LineCollection([], colors='lightgray', linestyles='--', label='Plan',
+                                                       zorder=1)
+        self.live_ax.add_collection(self._plan_trace, autolim=False)
+        # One collection for all cycles rather than an axvspan patch each; it is part of the blit background
+        self._span_coll = mcollections.PolyCollection([], facecolors='lightskyblue', alpha=0.3, zorder=0)
+        self.live_ax.add_collection(self._span_coll, autolim=False)
+        for direction, color in (('Forward', self.COLOR_FORWARD), ('Backward', self.COLOR_BACKWARD)):
+            self._live_lines[direction], = self.live_ax.plot([], [], color=color, linewidth=2.5,
+                                                             solid_capstyle='round', animated=True)
 
         plan_line = mlines.Line2D([], [], color='lightgray', linestyle='--', label='Plan')
         fwd_line = mlines.Line2D([], [], color=self.COLOR_FORWARD, label='Forward')
@@ -1136,25 +1878,225 @@ class PumpControlUI(tk.Tk):
 
         if not sns:
             self.live_ax.grid(True, linestyle='--', alpha=0.6)
+        self._prepare_live_plot()
+
+    def _prepare_live_plot(self):
+        if not self.live_ax: return
+
+        with self._render_lock:
+            # Use the pre-calculated plan if available, otherwise calculate it
+            if hasattr(self, 'plan_time_points') and len(self.plan_time_points):
+                plot_data = {'time_points': self.plan_time_points, 'rpm_points': self.plan_rpm_points,
+                             'cycle_spans': self.plot_data['cycle_spans']}
+            else:
+                plot_data = self._get_cached_sequence_data(self.sequence_data)
+
+            # Plan arrays are memoized per sequence, so rescale only when the plan or the time unit changed
+            time_points = plot_data['time_points']
+            if self._plan_time_np_src is not time_points or self._plan_time_np_factor != self.time_factor:
+                self._plan_time_np = np.multiply(time_points, self.time_factor, dtype=np.float64)
+                self._plan_time_np_src, self._plan_time_np_factor = time_points, self.time_factor
+            time_scaled = self._plan_time_np
+            rpm_data = np.asarray(plot_data['rpm_points'], dtype=np.float64)
+
+            self._plan_full = (time_scaled, rpm_data)
+            self._update_plan_trace()
+            self._span_coll.set_verts(_cycle_span_verts(plot_data.get('cycle_spans', []), self.time_factor))
+
+            self.live_ax.set_xlabel(f"Time ({self.time_unit})", fontsize=10)
+            if len(time_scaled):
+                t_min, t_max = time_scaled[0], time_scaled[-1]
+                self.live_ax.set_xlim(left=t_min - 0.05 * t_max, right=t_max * 1.05)
+            else:
+                self.live_ax.set_xlim(0, 1)
+
+            self._reset_live_trace()
+        self._request_live_draw()
 
-        self.live_fig.tight_layout(pad=1.5)
-        self.live_canvas.draw()
+    def _request_live_draw(self):
+        if self._draw_defer_depth:
+            self._draw_pending = True
+        else:
+            self.live_canvas.draw_idle()
+
+    @contextlib.contextmanager
+    def _defer_draw(self):
+        """ Hold back live-plot redraws inside the block and issue one draw_idle() at the end if any were requested. """
+        self._draw_defer_depth += 1
+        try:
+            yield
+        finally:
+            self._draw_defer_depth -= 1
+            if not self._draw_defer_depth and self._draw_pending:
+                self._draw_pending = False
+                if self.live_canvas:
+                    self.live_canvas.draw_idle()
+
+    def _reset_live_trace(self):
+        """ Empty the animated Forward/Backward trace lines and their point buffers. """
+        self._live_trace = {}
+        for direction, line in self._live_lines.items():
+            line.set_data([], [])
+            self._live_trace[direction] = [np.empty(self.LIVE_TRACE_INITIAL_POINTS),
+                                           np.empty(self.LIVE_TRACE_INITIAL_POINTS), 0]
+        self._live_trace_direction = None
+        self._live_trace_last = (0, 0)
+        self._last_plot_direction = None
+        if self._buf_t is None:
+            self._buf_t = np.empty(self.LIVE_TRACE_INITIAL_POINTS, dtype=np.float64)
+            self._buf_rpm = np.empty(self.LIVE_TRACE_INITIAL_POINTS, dtype=np.float64)
+            self._buf_dir = np.empty(self.LIVE_TRACE_INITIAL_POINTS, dtype=np.int8)
+        self._buf_i = 0
+
+    def _update_plan_trace(self):
+        time_scaled, rpm_data = self._plan_full
+        x, y = _minmax_decimate(time_scaled, rpm_data, int(self.live_ax.bbox.width))
+        self._plan_trace.set_segments([np.column_stack((x, y))] if len(x) else [])
+
+    def _on_live_resize(self, event):
+        with self._render_lock:
+            self.live_canvas.resize(event)
+            self._live_bg = None
+            if self._plan_trace is not None:
+                self._update_plan_trace()
+
+    def _on_live_map(self, event):
+        with self._render_lock:
+            self.live_canvas._update_device_pixel_ratio(event)
+
+    def _render_live_async(self):
+        # Rasterize on the render thread; _poll_live_render copies the result to Tk
+        if self._render_future is not None:
+            self._render_again = True
+            return
+        self._render_future = self._render_pool.submit(self._render_live_figure)
+        self.after(self.RENDER_POLL_MS, self._poll_live_render)
+
+    def _render_live_figure(self):
+        with self._render_lock:
+            # Agg part of FigureCanvasTkAgg.draw()
+            super(type(self.live_canvas), self.live_canvas).draw()
+
+    def _poll_live_render(self):
+        if not self._render_future.done():
+            self.after(self.RENDER_POLL_MS, self._poll_live_render)
+            return
+        future, self._render_future = self._render_future, None
+        try:
+            future.result()
+            with self._render_lock:
+                # Tk is only touched from the main thread
+                type(self.live_canvas).blit(self.live_canvas)
+        except Exception as e:
+            self._log(f"Live plot render failed: {e}")
+        if self._render_again:
+            self._render_again = False
+            self._render_live_async()
+
+    def _on_live_draw(self, event):
+        # A full draw leaves out the animated traces: keep the result as the blit background, then add them
+        self._live_bg = self.live_canvas.copy_from_bbox(self.live_ax.bbox)
+        self._live_bg_fig_bbox = self.live_fig.bbox.frozen()
+        for line in self._live_lines.values():
+            self.live_ax.draw_artist(line)
+
+    def _live_px_per_unit(self):
+        """ Display pixels per x-axis unit and per RPM on the live plot. """
+        if not self.live_ax:
+            return float('inf'), float('inf')
+        bbox = self.live_ax.bbox
+        x0, x1 = self.live_ax.get_xlim()
+        y0, y1 = self.live_ax.get_ylim()
+        return bbox.width / ((x1 - x0) or 1.0), bbox.height / ((y1 - y0) or 1.0)
 
     def _update_live_plot(self, time_scaled, rpm, direction):
+        """ Queue a trace point; _flush_live_plot draws queued points at most max_redraw_rate_hz times a second. """
         if not self.live_ax: return
 
-        color = self.COLOR_FORWARD if direction == 'Forward' else self.COLOR_BACKWARD
-        new_point = (time_scaled, rpm)
-
-        self.live_ax.plot(
-            [self.last_plot_point[0], new_point[0]],
-            [self.last_plot_point[1], new_point[1]],
-            color=color,
-            linewidth=2.5,
-            solid_capstyle='round'
-        )
-        self.last_plot_point = new_point
-        self.live_canvas.draw_idle()
+        i = self._buf_i
+        if i == len(self._buf_t):
+            self._buf_t, self._buf_rpm, self._buf_dir = (np.resize(buf, 2 * i) for buf in
+                                                          (self._buf_t, self._buf_rpm, self._buf_dir))
+        forward = direction == 'Forward'
+        self._buf_t[i] = time_scaled
+        self._buf_rpm[i] = rpm
+        self._buf_dir[i] = forward
+        self._buf_i = i + 1
+        self.last_plot_point = (time_scaled, rpm)
+        self._last_plot_direction = 'Forward' if forward else 'Backward'
+
+    def _flush_live_plot(self, reschedule=True):
+        """ Move the queued points into the trace lines and draw them with a single blit. """
+        self._live_flush_job = None
+        # Don't wait for a running render; keep the points for the next tick
+        if self._buf_i and self.live_ax and self._render_lock.acquire(blocking=not reschedule):
+            try:
+                n, self._buf_i = self._buf_i, 0
+                self._append_live_points(self._buf_t[:n], self._buf_rpm[:n], self._buf_dir[:n])
+                self._blit_live_traces()
+            finally:
+                self._render_lock.release()
+        if reschedule and self.sequence_is_running:
+            self._live_flush_job = self.after(int(1000 / self.max_redraw_rate_hz), self._flush_live_plot)
+
+    def _append_live_points(self, times, rpms, forward):
+        """ Append queued points (forward is 1 for Forward, 0 for Backward) to the trace lines. """
+        new_points = {'Forward': ([], []), 'Backward': ([], [])}
+        # Each direction is one line, fed run by run; a NaN gap separates the runs where the direction changed
+        bounds = [0, *(np.flatnonzero(forward[1:] != forward[:-1]) + 1).tolist(), len(times)]
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            direction = 'Forward' if forward[start] else 'Backward'
+            xs, ys = new_points[direction]
+            if direction != self._live_trace_direction:
+                if self._live_trace[direction][2] or xs:
+                    xs.append((np.nan,)); ys.append((np.nan,))
+                xs.append((self._live_trace_last[0],)); ys.append((self._live_trace_last[1],))
+            xs.append(times[start:end]); ys.append(rpms[start:end])
+            self._live_trace_direction = direction
+            self._live_trace_last = (times[end - 1], rpms[end - 1])
+
+        for direction, (xs, ys) in new_points.items():
+            if not xs: continue
+            new_x, new_y = np.concatenate(xs), np.concatenate(ys)
+            k = len(new_x)
+            x, y, n = self._live_trace[direction]
+            if n + k > self.LIVE_TRACE_MAX_POINTS:
+                n = self._compact_live_trace(x, y, n)
+            if n + k > len(x):
+                size = max(min(2 * (n + k), self.LIVE_TRACE_MAX_POINTS), n + k)
+                x, y = np.resize(x, size), np.resize(y, size)
+            x[n:n + k], y[n:n + k] = new_x, new_y
+            n += k
+            self._live_trace[direction] = [x, y, n]
+            self._live_lines[direction].set_data(x[:n], y[:n])
+
+    def _compact_live_trace(self, x, y, n):
+        """ Drop every other point from the older half of a trace buffer in place and return the new length.
+
+        NaN gaps and the points next to them are kept, so direction runs still start and end where they did.
+        """
+        gaps = np.isnan(x[:n])
+        keep = np.ones(n, dtype=bool)
+        keep[1:n // 2:2] = False
+        keep |= gaps
+        keep[:-1] |= gaps[1:]
+        keep[1:] |= gaps[:-1]
+        m = int(keep.sum())
+        x[:m], y[:m] = x[:n][keep], y[:n][keep]
+        return m
+
+    def _blit_live_traces(self):
+        # Blit only the axes area over the cached background instead of redrawing the whole figure
+        # Only blit over a background captured at the figure's current size (a resize or DPI change may not
+        # have redrawn yet); otherwise fall back to a full draw, which captures a new one
+        if self._live_bg is None or self._live_bg_fig_bbox.bounds != self.live_fig.bbox.bounds:
+            self._live_bg = None
+            self.live_canvas.draw_idle()
+            return
+        self.live_canvas.restore_region(self._live_bg)
+        for line in self._live_lines.values():
+            self.live_ax.draw_artist(line)
+        self.live_canvas.blit(self.live_ax.bbox)
 
     def _create_log_panel(self, parent):
         frame = ttk.LabelFrame(parent, text="Status & Log", padding="10")
@@ -1167,7 +2109,5 @@ class PumpControlUI(tk.Tk):
 
 
 if __name__ == "__main__":
-    if np and plt and Figure and FigureCanvasTkAgg:
-        plt.ion()
     app = PumpControlUI()
     app.mainloop()
\ No newline at end of file